@@ -13,7 +13,11 @@ from app.database import Base
 from app.models.user import User
 from app.models.author import Author
 from app.models.book import Book
-from app.models.borrow import BorrowRecord
+from app.models.borrow import BorrowRecord, ArchivedBorrowRecord
+from app.models.hold import Hold
+from app.models.circulation import CirculationDaily
+from app.models.idempotency import IdempotencyKey
+from app.models.change import ChangeEvent
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,34 @@
+"""Added book title snapshot to borrow records
+
+Revision ID: 0a6e3b9d5c71
+Revises: f1c84d2e7a59
+Create Date: 2026-10-18 16:41:27.115830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6e3b9d5c71'
+down_revision: Union[str, Sequence[str], None] = 'f1c84d2e7a59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('borrow_records', sa.Column('book_title', sa.String(length=255), nullable=True))
+
+    # Existing loans take the book's current title
+    op.execute(
+        "UPDATE borrow_records SET book_title = "
+        "(SELECT books.title FROM books WHERE books.id = borrow_records.book_id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('borrow_records', 'book_title')
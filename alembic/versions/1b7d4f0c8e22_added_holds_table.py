@@ -0,0 +1,48 @@
+"""Added holds table
+
+Revision ID: 1b7d4f0c8e22
+Revises: 0a6e3b9d5c71
+Create Date: 2026-10-18 17:20:55.604139
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7d4f0c8e22'
+down_revision: Union[str, Sequence[str], None] = '0a6e3b9d5c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('holds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('due_days', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('WAITING', 'FULFILLED', 'CANCELLED', name='holdstatus'), nullable=False),
+    sa.Column('borrow_record_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('fulfilled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['borrow_record_id'], ['borrow_records.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_holds_book_created', 'holds', ['book_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_holds_id'), 'holds', ['id'], unique=False)
+    op.create_index(op.f('ix_holds_user_id'), 'holds', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_holds_user_id'), table_name='holds')
+    op.drop_index(op.f('ix_holds_id'), table_name='holds')
+    op.drop_index('ix_holds_book_created', table_name='holds')
+    op.drop_table('holds')
+    sa.Enum(name='holdstatus').drop(op.get_bind(), checkfirst=True)
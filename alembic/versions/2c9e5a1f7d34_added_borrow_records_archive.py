@@ -0,0 +1,53 @@
+"""Added borrow records archive
+
+Revision ID: 2c9e5a1f7d34
+Revises: 1b7d4f0c8e22
+Create Date: 2026-10-18 18:02:36.318904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c9e5a1f7d34'
+down_revision: Union[str, Sequence[str], None] = '1b7d4f0c8e22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reuses the borrowstatus enum type created with borrow_records
+    status = sa.Enum('BORROWED', 'RETURNED', 'OVERDUE', name='borrowstatus').with_variant(
+        postgresql.ENUM('BORROWED', 'RETURNED', 'OVERDUE', name='borrowstatus', create_type=False),
+        'postgresql'
+    )
+    op.create_table('borrow_records_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('book_title', sa.String(length=255), nullable=True),
+    sa.Column('borrow_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('return_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', status, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_borrow_records_archive_user_borrow_date_id', 'borrow_records_archive',
+        ['user_id', sa.text('borrow_date DESC'), sa.text('id DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrow_records_archive_user_borrow_date_id', table_name='borrow_records_archive')
+    op.drop_table('borrow_records_archive')
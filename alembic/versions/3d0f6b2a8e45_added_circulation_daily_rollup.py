@@ -0,0 +1,41 @@
+"""Added circulation daily rollup
+
+Revision ID: 3d0f6b2a8e45
+Revises: 2c9e5a1f7d34
+Create Date: 2026-10-18 19:11:04.527310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d0f6b2a8e45'
+down_revision: Union[str, Sequence[str], None] = '2c9e5a1f7d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing loans: python -m app.services.rollup rebuild --start <first loan date>
+    op.create_table('circulation_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('book_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=True),
+    sa.Column('borrows', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('returns', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('overdues', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('day', 'book_id')
+    )
+    op.create_index('ix_circulation_daily_author_day', 'circulation_daily', ['author_id', 'day'], unique=False)
+    op.create_index('ix_circulation_daily_book_day', 'circulation_daily', ['book_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_circulation_daily_book_day', table_name='circulation_daily')
+    op.drop_index('ix_circulation_daily_author_day', table_name='circulation_daily')
+    op.drop_table('circulation_daily')
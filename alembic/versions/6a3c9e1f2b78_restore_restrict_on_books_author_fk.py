@@ -0,0 +1,41 @@
+"""Restore RESTRICT on books.author_id
+
+Revision ID: 6a3c9e1f2b78
+Revises: 5f2b8d4e0a67
+Create Date: 2026-10-18 22:41:09.530214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a3c9e1f2b78'
+down_revision: Union[str, Sequence[str], None] = '5f2b8d4e0a67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # c3a9f1d6e820 made this ON DELETE CASCADE; deleting an author must
+    # never take its books with it. SQLite's schema comes from the models.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_constraint('books_author_id_fkey', 'books', type_='foreignkey')
+    op.create_foreign_key('books_author_id_fkey', 'books', 'authors', ['author_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_constraint('books_author_id_fkey', 'books', type_='foreignkey')
+    op.create_foreign_key(
+        'books_author_id_fkey', 'books', 'authors',
+        ['author_id'], ['id'], ondelete='CASCADE'
+    )
@@ -0,0 +1,33 @@
+"""Added version columns for ETags
+
+Revision ID: b7d2e94c1a05
+Revises: 4580e0a3dd2f
+Create Date: 2026-10-18 11:26:03.871542
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e94c1a05'
+down_revision: Union[str, Sequence[str], None] = '4580e0a3dd2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('books', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('authors', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    # Author pages and author ETags look up books by author
+    op.create_index(op.f('ix_books_author_id'), 'books', ['author_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_books_author_id'), table_name='books')
+    op.drop_column('authors', 'version')
+    op.drop_column('books', 'version')
@@ -0,0 +1,53 @@
+"""Added active borrow index and ON DELETE CASCADE
+
+Revision ID: c3a9f1d6e820
+Revises: b7d2e94c1a05
+Create Date: 2026-10-18 13:04:51.227630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9f1d6e820'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e94c1a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_borrow_records_active_book_user', 'borrow_records', ['book_id', 'user_id'], unique=False,
+        postgresql_where=sa.text('return_date IS NULL'),
+        sqlite_where=sa.text('return_date IS NULL')
+    )
+
+    # SQLite can't alter constraints in place; its schema comes from the models
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_constraint('borrow_records_book_id_fkey', 'borrow_records', type_='foreignkey')
+    op.create_foreign_key(
+        'borrow_records_book_id_fkey', 'borrow_records', 'books',
+        ['book_id'], ['id'], ondelete='CASCADE'
+    )
+    op.drop_constraint('books_author_id_fkey', 'books', type_='foreignkey')
+    op.create_foreign_key(
+        'books_author_id_fkey', 'books', 'authors',
+        ['author_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint('books_author_id_fkey', 'books', type_='foreignkey')
+        op.create_foreign_key('books_author_id_fkey', 'books', 'authors', ['author_id'], ['id'])
+        op.drop_constraint('borrow_records_book_id_fkey', 'borrow_records', type_='foreignkey')
+        op.create_foreign_key('borrow_records_book_id_fkey', 'borrow_records', 'books', ['book_id'], ['id'])
+
+    op.drop_index('ix_borrow_records_active_book_user', table_name='borrow_records')
@@ -0,0 +1,44 @@
+"""Added composite indexes for book sorting
+
+Revision ID: d81f0b7c4e93
+Revises: c3a9f1d6e820
+Create Date: 2026-10-18 14:47:19.630148
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f0b7c4e93'
+down_revision: Union[str, Sequence[str], None] = 'c3a9f1d6e820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SORT_COLUMNS = ['title', 'published_date', 'created_at']
+AVAILABLE = sa.text('available_copies > 0')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in SORT_COLUMNS + ['available_copies']:
+        op.create_index(f'ix_books_{column}_id', 'books', [column, 'id'], unique=False)
+
+    # Partial variants for available_only=true listings
+    for column in SORT_COLUMNS:
+        op.create_index(
+            f'ix_books_available_{column}_id', 'books', [column, 'id'], unique=False,
+            postgresql_where=AVAILABLE, sqlite_where=AVAILABLE
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in SORT_COLUMNS:
+        op.drop_index(f'ix_books_available_{column}_id', table_name='books')
+
+    for column in SORT_COLUMNS + ['available_copies']:
+        op.drop_index(f'ix_books_{column}_id', table_name='books')
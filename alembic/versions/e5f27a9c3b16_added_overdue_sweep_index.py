@@ -0,0 +1,28 @@
+"""Added overdue sweep index
+
+Revision ID: e5f27a9c3b16
+Revises: d81f0b7c4e93
+Create Date: 2026-10-18 15:32:08.417205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f27a9c3b16'
+down_revision: Union[str, Sequence[str], None] = 'd81f0b7c4e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_borrow_records_return_due', 'borrow_records', ['return_date', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrow_records_return_due', table_name='borrow_records')
@@ -0,0 +1,38 @@
+"""Added borrow history indexes
+
+Revision ID: f1c84d2e7a59
+Revises: e5f27a9c3b16
+Create Date: 2026-10-18 16:05:43.902318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c84d2e7a59'
+down_revision: Union[str, Sequence[str], None] = 'e5f27a9c3b16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_borrow_records_user_borrow_date_id', 'borrow_records',
+        ['user_id', sa.text('borrow_date DESC'), sa.text('id DESC')], unique=False
+    )
+    op.create_index(
+        'ix_borrow_records_active_user_borrow_date_id', 'borrow_records',
+        ['user_id', sa.text('borrow_date DESC'), sa.text('id DESC')], unique=False,
+        postgresql_where=sa.text('return_date IS NULL'),
+        sqlite_where=sa.text('return_date IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrow_records_active_user_borrow_date_id', table_name='borrow_records')
+    op.drop_index('ix_borrow_records_user_borrow_date_id', table_name='borrow_records')
@@ -20,6 +20,59 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PASSWORD_HASH_WORKERS: int = 4            # Threads dedicated to bcrypt (off Starlette's threadpool)
+    PASSWORD_HASH_QUEUE_SIZE: int = 32        # Hashes allowed to wait for a worker; more get a 503
+    PASSWORD_HASH_RETRY_AFTER: int = 1        # Retry-After seconds sent with that 503
+    
+    # Search
+    SEARCH_SIMILARITY_THRESHOLD: float = 0.3  # Minimum trigram similarity for fuzzy matches
+    SEARCH_MAX_RESULTS: int = 1000            # Matches ordered by relevance (non-PostgreSQL); the rest follow by id
+    SEARCH_INDEX_REBUILD_INTERVAL: int = 300  # Seconds between in-memory index rebuilds per process (non-PostgreSQL)
+    BOOK_COUNT_CACHE_TTL: int = 60            # Seconds a cached search total stays valid
+    BOOK_COUNT_CACHE_SIZE: int = 1024         # Max distinct searches with a cached total
+    COUNT_ESTIMATE_MIN_ROWS: int = 10000      # Below this, count=estimate falls back to an exact count
+    FACET_AUTHOR_LIMIT: int = 20              # Authors returned in the author facet
+    SUGGEST_MAX_SCAN: int = 5000              # Prefix-index keys examined per lookup (prefixes over 3 chars)
+    SUGGEST_TOP_K: int = 50                   # Most popular entries cached per 1-3 char prefix
+    
+    # Caching
+    ENTITY_CACHE_BACKEND: str = "memory"      # "memory" (LRU + TTL) or "none"
+    ENTITY_CACHE_SIZE: int = 10000            # Max cached books/authors (each)
+    ENTITY_CACHE_TTL: int = 300               # Seconds before a cached book/author is reloaded
+    
+    # Bulk import/export
+    BOOK_IMPORT_CHUNK_SIZE: int = 1000        # Rows validated and inserted per transaction
+    BOOK_EXPORT_BATCH_SIZE: int = 1000        # Rows fetched per server-side cursor batch
+    
+    # Background jobs
+    OVERDUE_SWEEP_ENABLED: bool = True        # Run the overdue sweeper inside the app process
+    OVERDUE_SWEEP_INTERVAL: int = 300         # Seconds between overdue sweeps
+    OVERDUE_SWEEP_CHUNK_SIZE: int = 1000      # Loans marked overdue per UPDATE/commit
+    BORROW_ARCHIVE_ENABLED: bool = True       # Move old returned loans to borrow_records_archive
+    BORROW_ARCHIVE_INTERVAL: int = 3600       # Seconds between archive runs
+    BORROW_ARCHIVE_AFTER_DAYS: int = 365      # Returned loans older than this are archived
+    BORROW_ARCHIVE_BATCH_SIZE: int = 1000     # Records moved per INSERT/DELETE/commit
+    
+    # Reports
+    LATE_FEE_PER_DAY: float = 1.00            # Fee per whole day past due
+    LATE_FEE_MAX: float = 0                   # Cap per loan (0 = no cap)
+    REPORT_CHUNK_SIZE: int = 50000            # Loans per columnar chunk in reports
+    
+    # Holds
+    HOLD_EVENTS_HEARTBEAT: int = 15           # Seconds between SSE keepalives (and database re-checks)
+    
+    # Idempotency keys
+    IDEMPOTENCY_KEY_TTL: int = 86400          # Seconds a stored response is replayed for
+    IDEMPOTENCY_LOCK_TIMEOUT: int = 60        # Seconds before an unfinished request's key can be retried
+    IDEMPOTENCY_CLEANUP_ENABLED: bool = True  # Delete expired keys in the background
+    IDEMPOTENCY_CLEANUP_INTERVAL: int = 3600  # Seconds between cleanups
+    IDEMPOTENCY_CLEANUP_BATCH_SIZE: int = 1000  # Keys deleted per DELETE/commit
+    
+    # Change feed
+    CHANGE_FEED_SETTLE_SECONDS: int = 2       # Events younger than this are held back (commit-order gaps)
+    CHANGE_FEED_POLL_INTERVAL: float = 1.0    # Seconds between database polls per SSE stream
+    CHANGE_FEED_RETENTION_DAYS: int = 30      # Older events are deleted (0 = keep forever)
+    CHANGE_FEED_PRUNE_INTERVAL: int = 3600    # Seconds between prune runs
     
     # CORS
     ALLOWED_ORIGINS: List[str] = [
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from app.config import settings
@@ -14,6 +14,14 @@ engine = create_engine(
     max_overflow=10          # Max additional connections when needed
 )
 
+# SQLite ignores foreign keys (and ON DELETE CASCADE) unless asked per connection
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # Create SessionLocal class
 # Session = a "conversation" with the database
 SessionLocal = sessionmaker(
@@ -42,5 +50,5 @@ def get_db():
 
 
 def init_db():
-    from app.models import user, author, book, borrow  # Import all models
+    from app.models import user, author, book, borrow, hold, circulation, idempotency, change  # Import all models
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
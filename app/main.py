@@ -1,12 +1,25 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, Base, SessionLocal
+from app.services.search import SearchService
+from app.services.suggest import SuggestService
+from app.services.borrow import BorrowService
+from app.services.archive import BorrowArchiveService
+from app.services.idempotency import IdempotencyService
+from app.services.outbox import OutboxService
+from app.utils.cache import ReadThroughCache
+from app.utils.scheduler import PeriodicJob
+from app.utils.security import password_hash_pool
 from app.routes import (
     auth_router,
     authors_router,
     books_router,
-    borrow_router
+    borrow_router,
+    changes_router,
+    circulation_router,
+    holds_router,
+    reports_router
 )
 
 # Create FastAPI app instance
@@ -31,11 +44,48 @@ app = FastAPI(
 )
 
 
+# Background jobs
+# exclusive: database-wide work, run by one worker at a time (leader_lock)
+overdue_sweep = PeriodicJob(
+    "overdue_sweep",
+    BorrowService.sweep_overdue_books,
+    interval=settings.OVERDUE_SWEEP_INTERVAL,
+    exclusive=True
+)
+borrow_archive = PeriodicJob(
+    "borrow_archive",
+    BorrowArchiveService.run_archive,
+    interval=settings.BORROW_ARCHIVE_INTERVAL,
+    exclusive=True
+)
+idempotency_cleanup = PeriodicJob(
+    "idempotency_cleanup",
+    IdempotencyService.run_cleanup,
+    interval=settings.IDEMPOTENCY_CLEANUP_INTERVAL,
+    exclusive=True
+)
+search_index_rebuild = PeriodicJob(
+    "search_index_rebuild",
+    SearchService.rebuild_index,
+    interval=settings.SEARCH_INDEX_REBUILD_INTERVAL
+)
+change_feed_prune = PeriodicJob(
+    "change_feed_prune",
+    OutboxService.run_prune,
+    interval=settings.CHANGE_FEED_PRUNE_INTERVAL,
+    exclusive=True
+)
+
+
 # Register Routes
 app.include_router(auth_router)      # /api/v1/auth/*
 app.include_router(authors_router)   # /api/v1/authors/*
 app.include_router(books_router)     # /api/v1/books/*
 app.include_router(borrow_router)    # /api/v1/borrow/*
+app.include_router(changes_router)   # /api/v1/changes/*
+app.include_router(circulation_router)  # /api/v1/circulation/*
+app.include_router(holds_router)     # /api/v1/holds/*
+app.include_router(reports_router)   # /api/v1/reports/*
 
 
 # Startup Event
@@ -45,11 +95,50 @@ async def startup_event():
     print(f"📊 Database: {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'configured'}")
     print(f"📚 API Documentation: http://{settings.HOST}:{settings.PORT}/docs")
     print(f"🔐 Authentication enabled with JWT")
+    
+    db = SessionLocal()
+    try:
+        # Type-ahead suggestions are always served from memory
+        SuggestService.build_index(db)
+        print(f"💡 Suggestion index built")
+        
+        # Without pg_trgm, search is served from an in-process trigram index
+        if engine.dialect.name != "postgresql":
+            SearchService.build_index(db)
+            print(f"🔎 Search index built (in-memory trigram index)")
+    finally:
+        db.close()
+    
+    # Other workers' writes reach this process's index on rebuild
+    if engine.dialect.name != "postgresql":
+        search_index_rebuild.start()
+        print(f"🔁 Search index rebuilt every {settings.SEARCH_INDEX_REBUILD_INTERVAL}s")
+    
+    if settings.OVERDUE_SWEEP_ENABLED:
+        overdue_sweep.start()
+        print(f"⏰ Overdue sweep every {settings.OVERDUE_SWEEP_INTERVAL}s")
+    
+    if settings.BORROW_ARCHIVE_ENABLED:
+        borrow_archive.start()
+        print(f"🗄️ Borrow archive every {settings.BORROW_ARCHIVE_INTERVAL}s")
+    
+    if settings.IDEMPOTENCY_CLEANUP_ENABLED:
+        idempotency_cleanup.start()
+        print(f"🔑 Idempotency key cleanup every {settings.IDEMPOTENCY_CLEANUP_INTERVAL}s")
+    
+    if settings.CHANGE_FEED_RETENTION_DAYS > 0:
+        change_feed_prune.start()
+        print(f"📰 Change feed keeps {settings.CHANGE_FEED_RETENTION_DAYS} days of events")
 
 
 # Shutdown Event
 @app.on_event("shutdown")
 async def shutdown_event():
+    await overdue_sweep.stop()
+    await borrow_archive.stop()
+    await idempotency_cleanup.stop()
+    await change_feed_prune.stop()
+    await search_index_rebuild.stop()
     print(f"👋 Shutting down {settings.APP_NAME}")
 
 
@@ -73,3 +162,27 @@ async def health_check():
         "app_name": settings.APP_NAME,
         "version": settings.VERSION
     }
+
+
+# Cache Statistics Endpoint
+@app.get("/health/cache", tags=["Health"])
+async def cache_stats():
+    return {
+        name: cache.stats()
+        for name, cache in ReadThroughCache.registry.items()
+    }
+
+
+# Background Job Metrics Endpoint
+@app.get("/health/jobs", tags=["Health"])
+async def job_stats():
+    return {
+        name: job.stats()
+        for name, job in PeriodicJob.registry.items()
+    }
+
+
+# Password Hashing Pool Metrics Endpoint
+@app.get("/health/auth", tags=["Health"])
+async def auth_stats():
+    return password_hash_pool.stats()
@@ -5,6 +5,10 @@ Imports all models for easy access.
 from app.models.user import User
 from app.models.author import Author
 from app.models.book import Book
-from app.models.borrow import BorrowRecord
+from app.models.borrow import BorrowRecord, ArchivedBorrowRecord
+from app.models.hold import Hold
+from app.models.circulation import CirculationDaily
+from app.models.idempotency import IdempotencyKey
+from app.models.change import ChangeEvent
 
-__all__ = ["User", "Author", "Book", "BorrowRecord"]
\ No newline at end of file
+__all__ = ["User", "Author", "Book", "BorrowRecord", "ArchivedBorrowRecord", "Hold", "CirculationDaily", "IdempotencyKey", "ChangeEvent"]
\ No newline at end of file
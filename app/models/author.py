@@ -1,12 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from app.database import Base
 
 
 class Author(Base):
     
     __tablename__ = "authors"
+    __table_args__ = (
+        # Trigram index for substring/fuzzy name search (PostgreSQL only)
+        Index(
+            "ix_authors_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -15,12 +24,22 @@ class Author(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Bumped on every UPDATE (ORM or Core); used for ETags
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1
+    )
+    
     # Relationships
     # One author can have many books
     books = relationship(
         "Book",
         back_populates="author",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True  # the FK refuses deletes with books left; nothing to load
     )
     
     def __repr__(self):
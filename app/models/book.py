@@ -1,11 +1,44 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column, text
 from app.database import Base
 
 
 class Book(Base):    
     __tablename__ = "books"
+    __table_args__ = (
+        # Trigram index for substring/fuzzy title search (PostgreSQL only)
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        
+        # Composite (sort column, id) indexes: sorted listings and keyset
+        # pages become index-ordered scans instead of a sort per request
+        Index("ix_books_title_id", "title", "id"),
+        Index("ix_books_published_date_id", "published_date", "id"),
+        Index("ix_books_created_at_id", "created_at", "id"),
+        Index("ix_books_available_copies_id", "available_copies", "id"),
+        
+        # Same orderings restricted to available books (available_only=true)
+        Index(
+            "ix_books_available_title_id", "title", "id",
+            postgresql_where=text("available_copies > 0"),
+            sqlite_where=text("available_copies > 0")
+        ),
+        Index(
+            "ix_books_available_published_date_id", "published_date", "id",
+            postgresql_where=text("available_copies > 0"),
+            sqlite_where=text("available_copies > 0")
+        ),
+        Index(
+            "ix_books_available_created_at_id", "created_at", "id",
+            postgresql_where=text("available_copies > 0"),
+            sqlite_where=text("available_copies > 0")
+        ),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
@@ -15,7 +48,8 @@ class Book(Base):
     published_date = Column(Date, nullable=True)
     
     # Foreign Key (Links to Author)
-    author_id = Column(Integer, ForeignKey("authors.id"), nullable=False)
+    # No ON DELETE CASCADE: an author with books can't be deleted
+    author_id = Column(Integer, ForeignKey("authors.id"), nullable=False, index=True)
     
     # Availability
     total_copies = Column(Integer, default=1, nullable=False)
@@ -23,15 +57,27 @@ class Book(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Bumped on every UPDATE (ORM or Core); used for ETags
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1
+    )
+    
     # Relationships
     # Many books belong to one author
     author = relationship("Author", back_populates="books")
     
     # One book can have many borrow records
+    # passive_deletes: the database's ON DELETE CASCADE removes them,
+    # so deleting a book doesn't load its whole borrow history first
     borrow_records = relationship(
         "BorrowRecord",
         back_populates="book",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     
     def __repr__(self):
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from datetime import datetime, timezone
 import enum
 from app.database import Base
@@ -14,13 +14,46 @@ class BorrowStatus(str, enum.Enum):
 
 class BorrowRecord(Base):    
     __tablename__ = "borrow_records"
+    __table_args__ = (
+        # Partial index: only loans not yet returned (a small slice of the table).
+        # Serves "does this book have active borrows?" and the duplicate-borrow check.
+        Index(
+            "ix_borrow_records_active_book_user",
+            "book_id",
+            "user_id",
+            postgresql_where=text("return_date IS NULL"),
+            sqlite_where=text("return_date IS NULL")
+        ),
+        
+        # Overdue sweep: open loans (return_date IS NULL) by due date
+        Index("ix_borrow_records_return_due", "return_date", "due_date"),
+        
+        # Borrow history: one user's loans, newest first, in index order
+        Index(
+            "ix_borrow_records_user_borrow_date_id",
+            "user_id",
+            text("borrow_date DESC"),
+            text("id DESC")
+        ),
+        Index(
+            "ix_borrow_records_active_user_borrow_date_id",
+            "user_id",
+            text("borrow_date DESC"),
+            text("id DESC"),
+            postgresql_where=text("return_date IS NULL"),
+            sqlite_where=text("return_date IS NULL")
+        ),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
     
     # Foreign Keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    book_id = Column(Integer, ForeignKey("books.id"), nullable=False)
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False)
+    
+    # Title at checkout, so history never has to read the books table
+    book_title = Column(String(255), nullable=True)
     
     # Dates
     borrow_date = Column(
@@ -53,10 +86,6 @@ class BorrowRecord(Base):
     def __repr__(self):
         return f"<BorrowRecord User:{self.user_id} Book:{self.book_id}>"
     
-    @property
-    def book_title(self) -> str | None:
-        return self.book.title if self.book else None
-    
     @property
     def is_overdue(self) -> bool:
         if self.return_date:  # Already returned
@@ -64,6 +93,45 @@ class BorrowRecord(Base):
         return datetime.now(timezone.utc) > self.due_date
 
 
+
+class ArchivedBorrowRecord(Base):
+    """
+    Cold storage for long-returned loans (see BorrowArchiveService).
+    Same columns and ids as borrow_records, so history can merge the two;
+    no book foreign key: the title snapshot keeps old loans readable.
+    """
+    __tablename__ = "borrow_records_archive"
+    __table_args__ = (
+        Index(
+            "ix_borrow_records_archive_user_borrow_date_id",
+            "user_id",
+            text("borrow_date DESC"),
+            text("id DESC")
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    book_id = Column(Integer, nullable=False)
+    book_title = Column(String(255), nullable=True)
+    
+    borrow_date = Column(DateTime(timezone=True), nullable=False)
+    due_date = Column(DateTime(timezone=True), nullable=False)
+    return_date = Column(DateTime(timezone=True), nullable=False)
+    
+    status = Column(Enum(BorrowStatus), nullable=False)
+    
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ArchivedBorrowRecord User:{self.user_id} Book:{self.book_id}>"
+    
+    @property
+    def is_overdue(self) -> bool:
+        return False  # Only returned loans are archived
+
 """
 Understanding Relationships:
 ============================
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ChangeEvent(Base):
+    """
+    Transactional outbox: one row per catalog or loan change, inserted in
+    the same transaction as the change itself. The id is the feed's
+    sequence number.
+    """
+    __tablename__ = "change_events"
+    
+    # Sequence number (INTEGER on SQLite, so it stays the rowid)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    
+    entity = Column(String(20), nullable=False)   # book, author, loan
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(20), nullable=False)       # created, updated, deleted, returned, overdue
+    
+    # State after the change (NULL for deletes)
+    payload = Column(JSON, nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<ChangeEvent {self.id} {self.entity}:{self.entity_id} {self.op}>"
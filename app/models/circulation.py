@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, Date, Index
+from app.database import Base
+
+
+class CirculationDaily(Base):
+    """
+    Daily circulation rollup: one row per (day, book).
+    Maintained incrementally by the borrow, return and overdue paths;
+    rebuilt from borrow_records (+ archive) for backfills.
+    """
+    __tablename__ = "circulation_daily"
+    __table_args__ = (
+        # Per-author questions over a date range
+        Index("ix_circulation_daily_author_day", "author_id", "day"),
+        # Time series for one book
+        Index("ix_circulation_daily_book_day", "book_id", "day"),
+    )
+    
+    # Composite primary key: (day, book_id) also serves date-range scans
+    day = Column(Date, primary_key=True)
+    book_id = Column(Integer, primary_key=True, autoincrement=False)
+    
+    # Author at the time of the event (kept when the book is deleted)
+    author_id = Column(Integer, nullable=True)
+    
+    borrows = Column(Integer, nullable=False, default=0, server_default="0")
+    returns = Column(Integer, nullable=False, default=0, server_default="0")
+    overdues = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    def __repr__(self):
+        return f"<CirculationDaily {self.day} Book:{self.book_id}>"
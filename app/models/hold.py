@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Index
+from sqlalchemy.sql import func
+import enum
+from app.database import Base
+
+
+class HoldStatus(str, enum.Enum):
+    WAITING = "waiting"
+    FULFILLED = "fulfilled"
+    CANCELLED = "cancelled"
+
+
+class Hold(Base):
+    __tablename__ = "holds"
+    __table_args__ = (
+        # FIFO queue per book: oldest waiting hold first
+        Index("ix_holds_book_created", "book_id", "created_at"),
+    )
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Foreign Keys
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False)
+    
+    # Loan length to use when a copy is allocated
+    due_days = Column(Integer, nullable=False, default=14)
+    
+    status = Column(
+        Enum(HoldStatus),
+        default=HoldStatus.WAITING,
+        nullable=False
+    )
+    
+    # Loan created for this hold when a returned copy was allocated
+    borrow_record_id = Column(
+        Integer,
+        ForeignKey("borrow_records.id", ondelete="SET NULL"),
+        nullable=True
+    )
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    fulfilled_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<Hold User:{self.user_id} Book:{self.book_id} {self.status}>"
+
+
+"""
+Understanding the Hold Queue:
+=============================
+No copies left -> POST /api/v1/holds/ puts the user in line.
+
+On return, instead of putting the copy back on the shelf:
+  oldest WAITING hold for the book
+    -> new BorrowRecord for that user
+    -> hold becomes FULFILLED (borrow_record_id set)
+    -> waiting user is pushed an SSE event
+
+Only when nobody is waiting does available_copies go back up.
+"""
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    One row per (user, Idempotency-Key) on a POST that accepts the header.
+    Written before the request runs (status_code NULL = in progress),
+    completed with the response once it has.
+    """
+    __tablename__ = "idempotency_keys"
+    
+    # Composite primary key: a retry is answered with one PK lookup
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    
+    # What the key was first used for
+    method = Column(String(10), nullable=False)
+    path = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # SHA-256 of the request body
+    
+    # Stored response (NULL while the first request is still running)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey User:{self.user_id} {self.key}>"
@@ -1,11 +1,19 @@
 from app.routes.auth import router as auth_router
 from app.routes.authors import router as authors_router
 from app.routes.books import router as books_router
+from app.routes.changes import router as changes_router
 from app.routes.borrow import router as borrow_router
+from app.routes.circulation import router as circulation_router
+from app.routes.holds import router as holds_router
+from app.routes.reports import router as reports_router
 
 __all__ = [
     "auth_router",
     "authors_router", 
     "books_router",
-    "borrow_router"
+    "borrow_router",
+    "changes_router",
+    "circulation_router",
+    "holds_router",
+    "reports_router"
 ]
\ No newline at end of file
@@ -6,6 +6,10 @@ Handles user registration and login endpoints.
 Endpoints:
 - POST /api/v1/auth/register - Register new user
 - POST /api/v1/auth/login    - Login user
+
+Both are async: password hashing runs on a dedicated bounded pool
+(see PasswordHashPool), not on the threadpool other sync routes share.
+A saturated pool answers 503 with Retry-After.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -28,22 +32,22 @@ router = APIRouter(
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ):
     # Call service to create user
-    user = AuthService.create_user(db, user_data)
+    user = await AuthService.create_user_pooled(db, user_data)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login_user(
+async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     # Authenticate user
-    user = AuthService.authenticate_user(
+    user = await AuthService.authenticate_user_pooled(
         db,
         form_data.username,
         form_data.password
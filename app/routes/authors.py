@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from math import ceil
 
 from app.database import get_db
@@ -12,6 +12,7 @@ from app.schemas.author import (
 )
 from app.services.author import AuthorService
 from app.utils.dependencies import get_current_active_user
+from app.utils.etag import etag_matches, not_modified
 from app.models.user import User
 
 # Create router
@@ -42,8 +43,11 @@ def create_author(
     summary="List all authors"
 )
 def get_authors(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -52,6 +56,12 @@ def get_authors(
     authors, total = AuthorService.get_authors(db, skip, page_size)
     total_pages = ceil(total / page_size)
     
+    # Unchanged page: skip serialization entirely
+    etag = AuthorService.page_etag(authors, request.url.query, total)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
     # ✅ Convert each ORM object to Pydantic model
     author_list = [AuthorResponse.model_validate(author) for author in authors]
     
@@ -74,10 +84,21 @@ def get_authors(
 )
 def get_author(
     author_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    author = AuthorService.get_author_by_id(db, author_id)
+    # Conditional GET: answered from version-only queries
+    current_etag = None
+    if if_none_match:
+        current_etag = AuthorService.get_author_etag(db, author_id)
+        if current_etag and etag_matches(if_none_match, current_etag):
+            return not_modified(current_etag)
+    
+    etag, author = AuthorService.get_author_response(db, author_id, current_etag)
+    response.headers["ETag"] = etag
+    
     return author
 
 
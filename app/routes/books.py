@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from math import ceil
@@ -8,10 +10,18 @@ from app.schemas.book import (
     BookCreate,
     BookUpdate,
     BookResponse,
-    BookSearch
+    BookSearch,
+    BookBatchRequest,
+    BookBatchResponse
 )
-from app.services.book import BookService
+from app.services.book import BookService, FACETS
+from app.services.book_import import BookImportService
+from app.services.book_export import BookExportService
+from app.services.idempotency import IdempotencyService
+from app.services.suggest import SuggestService
+from app.config import settings
 from app.utils.dependencies import get_current_active_user
+from app.utils.etag import etag_matches, not_modified
 from app.models.user import User
 
 # Create router
@@ -29,16 +39,87 @@ router = APIRouter(
 )
 def create_book(
     book_data: BookCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255, description="Retries with the same key get the first response"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    book = BookService.create_book(db, book_data)
+    def create() -> BookResponse:
+        book = BookService.create_book(db, book_data)
+        
+        # Add computed field for response
+        book.author_name
+        # book.is_available = book.available_copies > 0
+        
+        return BookResponse.model_validate(book)
     
-    # Add computed field for response
-    book.author_name
-    # book.is_available = book.available_copies > 0
+    return IdempotencyService.run(
+        db, current_user.id, idempotency_key,
+        "POST", router.prefix + "/", book_data,
+        create, status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=BookBatchResponse,
+    summary="Get many books by id and/or ISBN"
+)
+def get_books_batch(
+    batch: BookBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return BookService.get_books_batch(db, batch)
+
+
+@router.post(
+    "/import",
+    response_model=dict,
+    summary="Bulk import books from a CSV or NDJSON feed"
+)
+async def import_books(
+    request: Request,
+    feed_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$", description="Feed format (default: from Content-Type)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # CSV needs a header row; NDJSON is one BookCreate object per line
+    if feed_format is None:
+        feed_format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
     
-    return book
+    processed = 0
+    imported = 0
+    errors = []
+    chunk = []
+    
+    # Body is read incrementally; validation and DB work run off the
+    # event loop, one threadpool call per chunk
+    async for row_number, data, error in BookImportService.iter_rows(request.stream(), feed_format):
+        processed += 1
+        if error:
+            errors.append({"row": row_number, "error": error})
+            continue
+        
+        chunk.append((row_number, data))
+        if len(chunk) >= settings.BOOK_IMPORT_CHUNK_SIZE:
+            count, chunk_errors = await run_in_threadpool(BookImportService.import_chunk, db, chunk)
+            imported += count
+            errors.extend(chunk_errors)
+            chunk = []
+    
+    if chunk:
+        count, chunk_errors = await run_in_threadpool(BookImportService.import_chunk, db, chunk)
+        imported += count
+        errors.extend(chunk_errors)
+    
+    errors.sort(key=lambda e: e["row"])
+    
+    return {
+        "processed": processed,
+        "imported": imported,
+        "failed": len(errors),
+        "errors": errors
+    }
 
 
 @router.get(
@@ -47,15 +128,38 @@ def create_book(
     summary="List and search books"
 )
 def get_books(
+    request: Request,
+    response: Response,
     title: Optional[str] = Query(None, description="Search by title"),
     author_name: Optional[str] = Query(None, description="Search by author name"),
     isbn: Optional[str] = Query(None, description="Search by ISBN"),
     available_only: bool = Query(False, description="Show only available books"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    pagination: str = Query("page", pattern="^(page|cursor)$", description="'page' (offset) or 'cursor' (keyset)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (implies pagination=cursor)"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: true for page, false for cursor)"),
+    count_mode: str = Query("exact", pattern="^(exact|estimate)$", description="'estimate' allows planner-based totals for broad searches"),
+    facets: Optional[str] = Query(None, description="Comma-separated facets to include: author, availability, year"),
+    sort: Optional[str] = Query(
+        None,
+        pattern="^-?(title|published_date|created_at|availability)$",
+        description="Sort field, '-' prefix for descending (ties broken by id)"
+    ),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
+    use_cursor = pagination == "cursor" or cursor is not None
+    
+    facet_names = [name.strip() for name in facets.split(",") if name.strip()] if facets else []
+    unknown = set(facet_names) - set(FACETS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown facets: {', '.join(sorted(unknown))}. Available: {', '.join(FACETS)}"
+        )
+    
     # Create search object
     search = BookSearch(
         title=title,
@@ -63,11 +167,43 @@ def get_books(
         isbn=isbn,
         available_only=available_only,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total if include_total is not None else not use_cursor,
+        count_mode=count_mode,
+        sort=sort
     )
     
+    if use_cursor:
+        books, next_cursor, total, is_estimate = BookService.get_books_by_cursor(db, search)
+        facet_counts = BookService.get_facets(db, search, facet_names) if facet_names else None
+        
+        etag = BookService.page_etag(books, request.url.query, total, next_cursor, facet_counts)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        
+        result = {
+            "books": [BookResponse.model_validate(book) for book in books],
+            "total": total,
+            "total_is_estimate": is_estimate,
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        }
+        if facet_counts is not None:
+            result["facets"] = facet_counts
+        
+        return result
+    
     # Get books
-    books, total = BookService.get_books(db, search)
+    books, total, is_estimate = BookService.get_books(db, search)
+    facet_counts = BookService.get_facets(db, search, facet_names) if facet_names else None
+    
+    # Unchanged page: skip serialization entirely
+    etag = BookService.page_etag(books, request.url.query, total, is_estimate, facet_counts)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     
     # Add computed fields
     book_list = [BookResponse.model_validate(book) for book in books]
@@ -75,13 +211,60 @@ def get_books(
     # Calculate total pages
     total_pages = ceil(total / page_size)
     
-    return {
+    result = {
         "books": book_list,
         "total": total,
+        "total_is_estimate": is_estimate,
         "page": page,
         "page_size": page_size,
         "total_pages": total_pages
     }
+    if facet_counts is not None:
+        result["facets"] = facet_counts
+    
+    return result
+
+@router.get(
+    "/suggest",
+    response_model=dict,
+    summary="Type-ahead suggestions for titles and authors"
+)
+def suggest_books(
+    q: str = Query(..., min_length=1, max_length=255, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Max suggestions per group"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # Served from the in-memory prefix index, no catalog query
+    return SuggestService.suggest(db, q, limit)
+
+@router.get(
+    "/export",
+    summary="Export books as NDJSON or CSV",
+    response_class=StreamingResponse
+)
+def export_books(
+    title: Optional[str] = Query(None, description="Search by title"),
+    author_name: Optional[str] = Query(None, description="Search by author name"),
+    isbn: Optional[str] = Query(None, description="Search by ISBN"),
+    available_only: bool = Query(False, description="Show only available books"),
+    feed_format: str = Query("ndjson", alias="format", pattern="^(csv|ndjson)$", description="Output format"),
+    current_user: User = Depends(get_current_active_user)
+):
+    search = BookSearch(
+        title=title,
+        author_name=author_name,
+        isbn=isbn,
+        available_only=available_only
+    )
+    
+    media_type = "text/csv" if feed_format == "csv" else "application/x-ndjson"
+    
+    return StreamingResponse(
+        BookExportService.stream(search, feed_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="books.{feed_format}"'}
+    )
 
 @router.get(
     "/{book_id}",
@@ -90,14 +273,20 @@ def get_books(
 )
 def get_book(
     book_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    book = BookService.get_book_by_id(db, book_id)
+    # Conditional GET: answered from a version-only query
+    current_etag = None
+    if if_none_match:
+        current_etag = BookService.get_book_etag(db, book_id)
+        if current_etag and etag_matches(if_none_match, current_etag):
+            return not_modified(current_etag)
     
-    # Add computed fields
-    book.author_name
-    # book.is_available = book.available_copies > 0
+    etag, book = BookService.get_book_response(db, book_id, current_etag)
+    response.headers["ETag"] = etag
     
     return book
 
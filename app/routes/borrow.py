@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from sqlalchemy.orm import Session
+from typing import Optional
 from math import ceil
 
 from app.database import get_db
-from app.schemas.borrow import BorrowCreate, BorrowResponse
+from app.schemas.borrow import (
+    BorrowCreate,
+    BorrowResponse,
+    BorrowBatchCreate,
+    ReturnBatchRequest,
+    BorrowBatchResponse
+)
 from app.services.borrow import BorrowService
+from app.services.idempotency import IdempotencyService
 from app.utils.dependencies import get_current_active_user
 from app.models.user import User
 
@@ -24,16 +32,46 @@ router = APIRouter(
 )
 def borrow_book(
     borrow_data: BorrowCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255, description="Retries with the same key get the first response"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    # Borrow book
-    borrow_record = BorrowService.borrow_book(db, current_user, borrow_data)
-    
-    # Add computed field
-    # borrow_record.book_title = borrow_record.book.title
-    
-    return borrow_record
+    # Borrow book (once per Idempotency-Key)
+    return IdempotencyService.run(
+        db, current_user.id, idempotency_key,
+        "POST", router.prefix + "/", borrow_data,
+        lambda: BorrowResponse.model_validate(
+            BorrowService.borrow_book(db, current_user, borrow_data)
+        ),
+        status_code=status.HTTP_201_CREATED
+    )
+
+# Borrow several books at once
+@router.post(
+    "/batch",
+    response_model=BorrowBatchResponse,
+    summary="Borrow several books in one transaction"
+)
+def borrow_books(
+    batch: BorrowBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # Per-book results; unavailable books don't block the rest
+    return BorrowService.borrow_books(db, current_user, batch)
+
+# Return several books at once
+@router.post(
+    "/return/batch",
+    response_model=BorrowBatchResponse,
+    summary="Return several borrowed books in one transaction"
+)
+def return_books(
+    batch: ReturnBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return BorrowService.return_books(db, current_user, batch)
 
 # Return a book
 @router.post(
@@ -49,9 +87,6 @@ def return_book(
     # Return book
     borrow_record = BorrowService.return_book(db, record_id, current_user)
     
-    # Add computed field
-    # borrow_record.book_title = borrow_record.book.title
-    
     return borrow_record
 
 # View borrow history
@@ -64,9 +99,28 @@ def get_borrow_history(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     active_only: bool = Query(False, description="Show only active borrows"),
+    pagination: str = Query("page", pattern="^(page|cursor)$", description="'page' (offset) or 'cursor' (keyset)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (implies pagination=cursor)"),
+    include_total: Optional[bool] = Query(None, description="Count all records (default: true for page, false for cursor)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
+    if pagination == "cursor" or cursor is not None:
+        records, next_cursor, total = BorrowService.get_user_borrow_history_by_cursor(
+            db,
+            current_user,
+            cursor,
+            page_size,
+            active_only,
+            include_total=bool(include_total)
+        )
+        
+        return {
+            "records": [BorrowResponse.model_validate(r) for r in records],
+            "total": total,
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        }
 
     # Get history
     records, total = BorrowService.get_user_borrow_history(
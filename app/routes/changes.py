@@ -0,0 +1,88 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.config import settings
+from app.database import get_db
+from app.schemas.change import ChangeEventResponse, ChangeFeedResponse
+from app.services.outbox import OutboxService
+from app.utils.dependencies import get_current_active_user
+from app.models.user import User
+
+# Create router
+router = APIRouter(
+    prefix="/api/v1/changes",
+    tags=["Changes"]
+)
+
+ENTITY_PATTERN = "^(book|author|loan)$"
+
+
+# Tail catalog and loan changes by sequence number
+@router.get(
+    "/",
+    response_model=ChangeFeedResponse,
+    summary="Changes after a sequence number, oldest first"
+)
+def get_changes(
+    since: int = Query(0, ge=0, description="Last sequence number seen (0 = from the start)"),
+    limit: int = Query(100, ge=1, le=1000),
+    entity: Optional[str] = Query(None, pattern=ENTITY_PATTERN),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    events, next_since, has_more = OutboxService.changes_since(db, since, limit, entity)
+    
+    return ChangeFeedResponse(
+        changes=[ChangeEventResponse.model_validate(event) for event in events],
+        next_since=next_since,
+        has_more=has_more
+    )
+
+# Same feed, pushed
+@router.get(
+    "/stream",
+    summary="Server-Sent Events stream of the change feed",
+    response_class=StreamingResponse
+)
+def stream_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Last sequence number seen"),
+    entity: Optional[str] = Query(None, pattern=ENTITY_PATTERN),
+    last_event_id: Optional[int] = Header(None, description="Set by EventSource on reconnect"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # The stream can stay open for hours; don't hold a pooled connection
+    db.close()
+    
+    async def stream():
+        position = last_event_id if last_event_id is not None else since
+        idle = 0.0
+        while not await request.is_disconnected():
+            events, position, has_more = await run_in_threadpool(
+                OutboxService.poll, position, 100, entity
+            )
+            for event in events:
+                yield f"id: {event.id}\nevent: {event.entity}_{event.op}\ndata: {event.model_dump_json()}\n\n"
+            
+            if has_more:
+                continue
+            if events:
+                idle = 0.0
+            elif idle >= settings.HOLD_EVENTS_HEARTBEAT:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            
+            await asyncio.sleep(settings.CHANGE_FEED_POLL_INTERVAL)
+            idle += settings.CHANGE_FEED_POLL_INTERVAL
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.rollup import CirculationRollupService, METRICS
+from app.utils.dependencies import get_current_active_user
+from app.models.user import User
+
+# Create router
+router = APIRouter(
+    prefix="/api/v1/circulation",
+    tags=["Circulation"]
+)
+
+# Longest range a time series returns, in days
+MAX_SERIES_DAYS = 366
+
+
+def _check_range(start: date, end: date) -> None:
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be after start"
+        )
+
+
+@router.get(
+    "/top",
+    summary="Most borrowed/returned/overdue books or authors in a date range"
+)
+def top_circulation(
+    start: date = Query(..., description="First day included"),
+    end: date = Query(..., description="First day excluded"),
+    metric: str = Query("borrows", pattern=f"^({'|'.join(METRICS)})$"),
+    group: str = Query("book", pattern="^(book|author)$"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> List[dict]:
+    _check_range(start, end)
+    return CirculationRollupService.top(db, metric, group, start, end, limit)
+
+
+@router.get(
+    "/timeseries",
+    summary="Daily borrows, returns and overdues, optionally for one book or author"
+)
+def circulation_time_series(
+    start: date = Query(..., description="First day included"),
+    end: date = Query(..., description="First day excluded"),
+    book_id: Optional[int] = Query(None),
+    author_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> List[dict]:
+    _check_range(start, end)
+    if end - start > timedelta(days=MAX_SERIES_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Time series cover at most {MAX_SERIES_DAYS} days"
+        )
+    return CirculationRollupService.time_series(db, start, end, book_id, author_id)
@@ -0,0 +1,105 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Header, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.config import settings
+from app.database import get_db
+from app.schemas.hold import HoldCreate, HoldResponse
+from app.services.hold import HoldNotifier, HoldService
+from app.utils.dependencies import get_current_active_user
+from app.models.user import User
+
+# Create router
+router = APIRouter(
+    prefix="/api/v1/holds",
+    tags=["Holds"]
+)
+
+
+# Join the queue for a book with no copies left
+@router.post(
+    "/",
+    response_model=HoldResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Place a hold on an unavailable book"
+)
+def place_hold(
+    hold_data: HoldCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return HoldService.place_hold(db, current_user, hold_data)
+
+# List my holds
+@router.get(
+    "/",
+    response_model=List[HoldResponse],
+    summary="List my holds with queue positions"
+)
+def get_holds(
+    active_only: bool = Query(False, description="Show only waiting holds"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return HoldService.get_user_holds(db, current_user, active_only)
+
+# Push notifications instead of polling
+@router.get(
+    "/events",
+    summary="Server-Sent Events stream: one event per filled hold",
+    response_class=StreamingResponse
+)
+def hold_events(
+    request: Request,
+    last_event_id: Optional[int] = Header(None, description="Set by EventSource on reconnect"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    user_id = current_user.id
+    
+    # The stream can stay open for hours; don't hold a pooled connection
+    db.close()
+    
+    async def stream():
+        # First round: resume after Last-Event-ID, or replay holds whose
+        # loan is still open (filled before this stream connected)
+        since = None
+        wake = HoldNotifier.subscribe(user_id)
+        try:
+            while not await request.is_disconnected():
+                # Clear before checking, so a fill in between isn't missed
+                wake.clear()
+                holds = await run_in_threadpool(HoldService.fulfilled_since, user_id, since, last_event_id)
+                for hold in holds:
+                    since = hold.fulfilled_at
+                    yield f"id: {hold.id}\nevent: hold_fulfilled\ndata: {hold.model_dump_json()}\n\n"
+                
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=settings.HOLD_EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            HoldNotifier.unsubscribe(user_id, wake)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Leave the queue
+@router.delete(
+    "/{hold_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Cancel a waiting hold"
+)
+def cancel_hold(
+    hold_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return HoldService.cancel_hold(db, hold_id, current_user)
@@ -0,0 +1,42 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.services.reports import CirculationReportService, REPORTS
+from app.utils.dependencies import get_current_active_user
+from app.models.user import User
+
+# Create router
+router = APIRouter(
+    prefix="/api/v1/reports",
+    tags=["Reports"]
+)
+
+
+@router.get(
+    "/circulation",
+    summary="Late fees and circulation report as CSV",
+    response_class=StreamingResponse
+)
+def circulation_report(
+    start: date = Query(..., description="First borrow date included"),
+    end: date = Query(..., description="First borrow date excluded"),
+    report: str = Query(
+        "books",
+        pattern=f"^({'|'.join(REPORTS)})$",
+        description="'loans' (one row per loan), 'books' or 'users' (totals), 'overdue' (days-late distribution)"
+    ),
+    current_user: User = Depends(get_current_active_user)
+):
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be after start"
+        )
+    
+    return StreamingResponse(
+        CirculationReportService.stream(report, start, end),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="circulation-{report}-{start}-{end}.csv"'}
+    )
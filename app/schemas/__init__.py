@@ -15,12 +15,22 @@ from app.schemas.book import (
     BookCreate,
     BookUpdate,
     BookResponse,
-    BookSearch
+    BookSearch,
+    BookBatchRequest,
+    BookBatchResponse
 )
 from app.schemas.borrow import (
     BorrowCreate,
     BorrowResponse,
-    BorrowHistory
+    BorrowHistory,
+    BorrowBatchCreate,
+    ReturnBatchRequest,
+    BorrowBatchItem,
+    BorrowBatchResponse
+)
+from app.schemas.hold import (
+    HoldCreate,
+    HoldResponse
 )
 
 __all__ = [
@@ -40,8 +50,17 @@ __all__ = [
     "BookUpdate",
     "BookResponse",
     "BookSearch",
+    "BookBatchRequest",
+    "BookBatchResponse",
     # Borrow
     "BorrowCreate",
     "BorrowResponse",
-    "BorrowHistory"
+    "BorrowHistory",
+    "BorrowBatchCreate",
+    "ReturnBatchRequest",
+    "BorrowBatchItem",
+    "BorrowBatchResponse",
+    # Hold
+    "HoldCreate",
+    "HoldResponse"
 ]
\ No newline at end of file
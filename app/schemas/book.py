@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from datetime import date, datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class BookBase(BaseModel):
@@ -54,3 +54,37 @@ class BookSearch(BaseModel):
     available_only: Optional[bool] = False
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=10, ge=1, le=100)
+    cursor: Optional[str] = None  # Keyset pagination token (replaces page)
+    include_total: bool = True
+    count_mode: str = Field(default="exact", pattern="^(exact|estimate)$")
+    # Field name, "-" prefix for descending (e.g. "-published_date")
+    sort: Optional[str] = Field(
+        default=None,
+        pattern="^-?(title|published_date|created_at|availability)$"
+    )
+
+
+class BookBatchRequest(BaseModel):
+    ids: List[int] = Field(default_factory=list, max_length=100)
+    isbns: List[str] = Field(default_factory=list, max_length=100)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "ids": [3, 1, 42],
+                "isbns": ["9780747532699"]
+            }
+        }
+    )
+    
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.ids and not self.isbns:
+            raise ValueError("Provide at least one id or isbn")
+        return self
+
+
+class BookBatchResponse(BaseModel):
+    books: List[BookResponse]
+    missing_ids: List[int]
+    missing_isbns: List[str]
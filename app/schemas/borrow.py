@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.models.borrow import BorrowStatus
 
 
@@ -38,3 +38,45 @@ class BorrowHistory(BaseModel):
     page: int
     page_size: int
     total_pages: int
+
+
+class BorrowBatchCreate(BaseModel):
+    book_ids: List[int] = Field(..., min_length=1, max_length=50)
+    due_days: int = Field(default=14, ge=1, le=90)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "book_ids": [1, 7, 12],
+                "due_days": 14
+            }
+        }
+    )
+
+
+class ReturnBatchRequest(BaseModel):
+    record_ids: List[int] = Field(..., min_length=1, max_length=50)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "record_ids": [31, 32]
+            }
+        }
+    )
+
+
+class BorrowBatchItem(BaseModel):
+    # book_id for checkouts, record_id for returns
+    book_id: Optional[int] = None
+    record_id: Optional[int] = None
+    success: bool
+    status_code: int
+    detail: Optional[str] = None
+    record: Optional[BorrowResponse] = None
+
+
+class BorrowBatchResponse(BaseModel):
+    results: List[BorrowBatchItem]
+    succeeded: int
+    failed: int
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Any, List, Optional
+
+
+class ChangeEventResponse(BaseModel):
+    id: int  # Sequence number: pass the last one seen as ?since=
+    entity: str
+    entity_id: int
+    op: str
+    payload: Optional[Any] = None
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChangeFeedResponse(BaseModel):
+    changes: List[ChangeEventResponse]
+    next_since: int  # Resume from here on the next poll
+    has_more: bool   # Poll again right away
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime
+from typing import Optional
+from app.models.hold import HoldStatus
+
+
+class HoldCreate(BaseModel):
+    book_id: int = Field(..., gt=0)
+    due_days: int = Field(default=14, ge=1, le=90)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "book_id": 1,
+                "due_days": 14
+            }
+        }
+    )
+
+
+class HoldResponse(BaseModel):
+    id: int
+    user_id: int
+    book_id: int
+    due_days: int
+    status: HoldStatus
+    borrow_record_id: Optional[int] = None
+    created_at: datetime
+    fulfilled_at: Optional[datetime] = None
+    position: Optional[int] = None  # 1 = next in line (waiting holds only)
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -2,10 +2,20 @@ from app.services.auth import AuthService
 from app.services.author import AuthorService
 from app.services.book import BookService
 from app.services.borrow import BorrowService
+from app.services.search import SearchService
+from app.services.book_import import BookImportService
+from app.services.book_export import BookExportService
+from app.services.entity_cache import EntityCache
+from app.services.suggest import SuggestService
 
 __all__ = [
     "AuthService",
     "AuthorService",
     "BookService",
-    "BorrowService"
+    "BorrowService",
+    "SearchService",
+    "BookImportService",
+    "BookExportService",
+    "EntityCache",
+    "SuggestService"
 ]
\ No newline at end of file
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.borrow import ArchivedBorrowRecord, BorrowRecord
+
+
+# Columns copied verbatim from borrow_records into the archive
+ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "book_id",
+    "book_title",
+    "borrow_date",
+    "due_date",
+    "return_date",
+    "status",
+    "created_at",
+    "updated_at"
+)
+
+
+class BorrowArchiveService:
+    """
+    Hot/Cold Borrow Records
+    =======================
+    Loans returned more than BORROW_ARCHIVE_AFTER_DAYS ago move from
+    borrow_records to borrow_records_archive, in batches of
+    BORROW_ARCHIVE_BATCH_SIZE (INSERT ... SELECT, then DELETE, one commit
+    per batch). borrow_records - and every index the borrow, return,
+    duplicate-check and overdue paths use - only holds open and recent
+    loans. Borrow history merges both tables (see BorrowService).
+    """
+
+    @staticmethod
+    def archive_returned(
+        db: Session,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> int:
+        # Returns the number of records moved
+        older_than_days = older_than_days if older_than_days is not None else settings.BORROW_ARCHIVE_AFTER_DAYS
+        batch_size = batch_size or settings.BORROW_ARCHIVE_BATCH_SIZE
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+
+        columns = [getattr(BorrowRecord, name) for name in ARCHIVED_COLUMNS]
+
+        moved = 0
+        while True:
+            # return_date range: served by ix_borrow_records_return_due
+            ids = db.execute(
+                select(BorrowRecord.id)
+                .where(BorrowRecord.return_date < cutoff)
+                .order_by(BorrowRecord.return_date)
+                .limit(batch_size)
+            ).scalars().all()
+
+            if not ids:
+                break
+
+            db.execute(
+                insert(ArchivedBorrowRecord).from_select(
+                    list(ARCHIVED_COLUMNS),
+                    select(*columns).where(BorrowRecord.id.in_(ids))
+                )
+            )
+            db.execute(
+                delete(BorrowRecord)
+                .where(BorrowRecord.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            moved += len(ids)
+            if len(ids) < batch_size:
+                break
+
+        return moved
+
+    @staticmethod
+    def run_archive() -> int:
+        # Scheduled entry point: own session
+        db = SessionLocal()
+        try:
+            return BorrowArchiveService.archive_returned(db)
+        finally:
+            db.close()
@@ -1,13 +1,38 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.utils.security import get_password_hash, verify_password
+from app.utils.security import (
+    get_password_hash,
+    verify_password,
+    hash_password_pooled,
+    verify_password_pooled
+)
 
 
 class AuthService:
     @staticmethod
     def create_user(db: Session, user_data: UserCreate) -> User:
+        AuthService._check_available(db, user_data)
+        
+        hashed_password = get_password_hash(user_data.password)
+        
+        return AuthService._insert_user(db, user_data, hashed_password)
+    
+    @staticmethod
+    async def create_user_pooled(db: Session, user_data: UserCreate) -> User:
+        # create_user for async routes: queries on the threadpool, bcrypt on
+        # its own bounded pool (503 when saturated). Duplicates are rejected
+        # before any hashing.
+        await run_in_threadpool(AuthService._check_available, db, user_data)
+        
+        hashed_password = await hash_password_pooled(user_data.password)
+        
+        return await run_in_threadpool(AuthService._insert_user, db, user_data, hashed_password)
+    
+    @staticmethod
+    def _check_available(db: Session, user_data: UserCreate) -> None:
         existing_email = db.query(User).filter(
             User.email == user_data.email
         ).first()
@@ -28,9 +53,9 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
             )
-        
-        hashed_password = get_password_hash(user_data.password)
-        
+    
+    @staticmethod
+    def _insert_user(db: Session, user_data: UserCreate, hashed_password: str) -> User:
         new_user = User(
             email=user_data.email,
             username=user_data.username,
@@ -47,25 +72,46 @@ class AuthService:
     
     @staticmethod
     def authenticate_user(db: Session, username: str, password: str) -> User:
+        user = AuthService._find_user(db, username)
+        
+        # Verify password
+        if not verify_password(password, user.hashed_password):
+            AuthService._reject_credentials()
+        
+        return AuthService._check_active(user)
+    
+    @staticmethod
+    async def authenticate_user_pooled(db: Session, username: str, password: str) -> User:
+        # authenticate_user for async routes, bcrypt on its own pool
+        user = await run_in_threadpool(AuthService._find_user, db, username)
+        
+        # Verify password
+        if not await verify_password_pooled(password, user.hashed_password):
+            AuthService._reject_credentials()
+        
+        return AuthService._check_active(user)
+    
+    @staticmethod
+    def _find_user(db: Session, username: str) -> User:
         # Find user by username
         user = db.query(User).filter(User.username == username).first()
         
         # User doesn't exist
         if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect username or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Verify password
-        if not verify_password(password, user.hashed_password):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect username or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            AuthService._reject_credentials()
         
+        return user
+    
+    @staticmethod
+    def _reject_credentials() -> None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    @staticmethod
+    def _check_active(user: User) -> User:
         # Check if account is active
         if not user.is_active:
             raise HTTPException(
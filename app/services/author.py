@@ -1,8 +1,16 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import exists
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from app.models.author import Author
-from app.schemas.author import AuthorCreate, AuthorUpdate
+from app.models.book import Book
+from app.schemas.author import AuthorCreate, AuthorUpdate, AuthorWithBooks
+from app.services.book import BookService
+from app.services.search import SearchService
+from app.services.suggest import SuggestService
+from app.services.entity_cache import EntityCache
+from app.services.outbox import OutboxService
+from app.utils.etag import make_etag
 
 
 class AuthorService:
@@ -15,11 +23,16 @@ class AuthorService:
             bio=author_data.bio
         )
         
-        # Save to database
+        # Save to database, with its change event
         db.add(new_author)
+        db.flush()
+        OutboxService.author_changed(db, new_author, "created")
         db.commit()
         db.refresh(new_author)
         
+        SearchService.index_author(new_author)
+        SuggestService.index_author(new_author)
+        
         return new_author
     
     @staticmethod
@@ -52,6 +65,81 @@ class AuthorService:
         
         return author
     
+    @staticmethod
+    def author_etag(
+        author_id: int,
+        author_version: int,
+        book_versions: List[Tuple[int, int]]
+    ) -> str:
+        # AuthorWithBooks embeds the books, so their versions count too
+        return make_etag("author", author_id, author_version, sorted(book_versions))
+    
+    @staticmethod
+    def page_etag(authors: List[Author], *context) -> str:
+        return make_etag(
+            "authors",
+            *context,
+            [(author.id, author.version) for author in authors]
+        )
+    
+    @staticmethod
+    def get_author_response(
+        db: Session,
+        author_id: int,
+        current_etag: Optional[str] = None
+    ) -> Tuple[str, AuthorWithBooks]:
+        """
+        Returns (etag, response). Read-through cached; 404s are not cached.
+        current_etag (from get_author_etag) drops a cached entry that lags it.
+        """
+        if current_etag is not None:
+            cached = EntityCache.authors.peek(author_id)
+            if cached is not None and cached[0] != current_etag:
+                EntityCache.authors.invalidate(author_id)
+        
+        def load():
+            author = db.query(Author)\
+                .options(selectinload(Author.books))\
+                .filter(Author.id == author_id)\
+                .first()
+            
+            if not author:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Author with id {author_id} not found"
+                )
+            
+            etag = AuthorService.author_etag(
+                author.id,
+                author.version,
+                [(book.id, book.version) for book in author.books]
+            )
+            return etag, AuthorWithBooks.model_validate(author)
+        
+        return EntityCache.authors.get_or_load(author_id, load)
+    
+    @staticmethod
+    def get_author_etag(db: Session, author_id: int) -> Optional[str]:
+        """
+        Current ETag of an author without loading or serializing it,
+        from version-only queries (never from the cache, see
+        BookService.get_book_etag).
+        None if the author doesn't exist.
+        """
+        version = db.query(Author.version).filter(Author.id == author_id).scalar()
+        if version is None:
+            return None
+        
+        book_versions = db.query(Book.id, Book.version)\
+            .filter(Book.author_id == author_id)\
+            .all()
+        
+        return AuthorService.author_etag(
+            author_id,
+            version,
+            [tuple(row) for row in book_versions]
+        )
+    
     @staticmethod
     def update_author(
         db: Session, 
@@ -73,9 +161,19 @@ class AuthorService:
             setattr(author, field, value)
         
         # Save changes
+        OutboxService.author_changed(db, author, "updated")
         db.commit()
         db.refresh(author)
         
+        SearchService.index_author(author)
+        SuggestService.index_author(author)
+        
+        # Cached book responses carry the author's name; cached totals
+        # (author_name searches) and author facets depend on it too
+        book_ids = db.query(Book.id).filter(Book.author_id == author_id).all()
+        EntityCache.invalidate_author(author_id, [book_id for (book_id,) in book_ids])
+        BookService.invalidate_counts()
+        
         return author
     
     @staticmethod
@@ -89,8 +187,12 @@ class AuthorService:
                 detail=f"Author with id {author_id} not found"
             )
         
-        # Check if author has books
-        if author.books:
+        # Check if author has books (EXISTS, no rows loaded)
+        has_books = db.query(
+            exists().where(Book.author_id == author_id)
+        ).scalar()
+        
+        if has_books:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete author with existing books. Delete or reassign books first."
@@ -98,6 +200,12 @@ class AuthorService:
         
         # Delete author
         db.delete(author)
+        OutboxService.author_changed(db, author, "deleted")
         db.commit()
         
+        SearchService.remove_author(author_id)
+        SuggestService.remove_author(author_id)
+        EntityCache.invalidate_author(author_id)
+        BookService.invalidate_counts()
+        
         return {"message": "Author deleted successfully"}
@@ -1,10 +1,57 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import text, exists, extract, func, case, or_
+from sqlalchemy.orm import Session, Query, joinedload, selectinload
 from fastapi import HTTPException, status
-from typing import List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import date
 from app.models.book import Book
 from app.models.author import Author
-from app.schemas.book import BookCreate, BookUpdate, BookSearch
+from app.models.borrow import BorrowRecord
+from app.schemas.book import (
+    BookCreate,
+    BookUpdate,
+    BookSearch,
+    BookResponse,
+    BookBatchRequest,
+    BookBatchResponse
+)
+from app.services.search import SearchService
+from app.services.suggest import SuggestService
+from app.services.entity_cache import EntityCache
+from app.services.hold import HoldService
+from app.services.outbox import OutboxService
+from app.utils.pagination import (
+    encode_cursor,
+    decode_cursor,
+    keyset_filter,
+    order_by_keyset,
+    cursor_timestamp
+)
+from app.utils.cache import TTLCache
+from app.utils.etag import make_etag
+from app.config import settings
+
+
+# Search totals keyed by the normalized filter -> (total, is_estimate)
+_count_cache = TTLCache(
+    maxsize=settings.BOOK_COUNT_CACHE_SIZE,
+    ttl=settings.BOOK_COUNT_CACHE_TTL
+)
+
+# Facet buckets keyed by the normalized filter + requested facets
+_facet_cache = TTLCache(
+    maxsize=settings.BOOK_COUNT_CACHE_SIZE,
+    ttl=settings.BOOK_COUNT_CACHE_TTL
+)
+
+FACETS = ("author", "availability", "year")
+
+# sort= field -> column; each has a composite (column, id) index
+SORT_COLUMNS = {
+    "title": Book.title,
+    "published_date": Book.published_date,
+    "created_at": Book.created_at,
+    "availability": Book.available_copies
+}
 
 
 class BookService:
@@ -44,33 +91,65 @@ class BookService:
             available_copies=book_data.available_copies
         )
         
-        # Save to database
+        # Save to database, with its change event
         db.add(new_book)
+        db.flush()
+        OutboxService.book_changed(db, new_book, "created")
+        # Read before commit: afterwards the id would cost a refresh SELECT
+        book_id = new_book.id
         db.commit()
-        db.refresh(new_book)
+        new_book = BookService._reload_with_author(db, book_id)
+        
+        SearchService.index_book(new_book)
+        SuggestService.index_title(new_book.id, new_book.title)
+        BookService.invalidate_counts()
+        EntityCache.invalidate_book(new_book.id, new_book.author_id)
         
         return new_book
     
     @staticmethod
-    def get_books(
-        db: Session,
-        search: BookSearch
-    ) -> Tuple[List[Book], int]:
-       
-        query = db.query(Book)
+    def _reload_with_author(db: Session, book_id: int) -> Book:
+        # Replaces db.refresh(): one SELECT that also fills book.author,
+        # so serializing author_name doesn't trigger a lazy load
+        return db.query(Book)\
+            .options(joinedload(Book.author))\
+            .filter(Book.id == book_id)\
+            .one()
+    
+    @staticmethod
+    def _sort_spec(search: BookSearch) -> Tuple[str, Any, bool]:
+        # -> (sort key, column, descending); id order when no sort is given
+        if not search.sort:
+            return "id", Book.id, False
+        descending = search.sort.startswith("-")
+        return search.sort, SORT_COLUMNS[search.sort.lstrip("-")], descending
+    
+    @staticmethod
+    def _sort_value(column, book: Book) -> Any:
+        return getattr(book, column.key)
+    
+    @staticmethod
+    def _parse_sort_value(db: Session, column, value: Any) -> Any:
+        # Cursor values travel as JSON; turn dates back into Python types
+        if value is None:
+            return None
+        if column is Book.published_date:
+            return date.fromisoformat(value)
+        if column is Book.created_at:
+            return cursor_timestamp(value, db.get_bind().dialect.name)
+        # A str for an int column (or vice versa) would fail in the database
+        if not isinstance(value, column.type.python_type):
+            raise ValueError("Cursor value does not match the sort column")
+        return value
+    
+    @staticmethod
+    def _filtered_query(db: Session, search: BookSearch, ranked: bool = True):
+        # Authors for the whole page are fetched in one extra IN query
+        query = db.query(Book).options(selectinload(Book.author))
         
         # Apply filters
-        if search.title:
-            # Case-insensitive partial match
-            query = query.filter(
-                Book.title.ilike(f"%{search.title}%")
-            )
-        
-        if search.author_name:
-            # Join with Author table to search by author name
-            query = query.join(Author).filter(
-                Author.name.ilike(f"%{search.author_name}%")
-            )
+        # Title/author name: trigram substring + fuzzy match, ranked by relevance
+        query = SearchService.apply_text_filters(db, query, search, ranked)
         
         if search.isbn:
             query = query.filter(Book.isbn == search.isbn)
@@ -78,18 +157,261 @@ class BookService:
         if search.available_only:
             query = query.filter(Book.available_copies > 0)
         
-        # Get total count before pagination
-        total = query.count()
+        return query
+    
+    @staticmethod
+    def invalidate_counts(available_only: bool = False) -> None:
+        """
+        Drops cached search totals after a write.
+        available_only=True only drops totals that filter on availability
+        (borrow/return change available_copies, nothing else).
+        """
+        if available_only:
+            _count_cache.invalidate(lambda key: key[3])
+            # Availability buckets change with every borrow/return
+            _facet_cache.invalidate(lambda key: "availability" in key[-1] or key[3])
+        else:
+            _count_cache.clear()
+            _facet_cache.clear()
+    
+    @staticmethod
+    def _count_key(search: BookSearch) -> tuple:
+        return (
+            search.title.lower() if search.title else None,
+            search.author_name.lower() if search.author_name else None,
+            search.isbn or None,
+            bool(search.available_only),
+            search.count_mode
+        )
+    
+    @staticmethod
+    def count_books(
+        db: Session,
+        search: BookSearch,
+        query: Query
+    ) -> Tuple[int, bool]:
+        """
+        Total matches for a search -> (total, is_estimate).
+        Served from the count cache when possible. With
+        count_mode="estimate" on PostgreSQL, broad searches use planner
+        statistics instead of COUNT(*).
+        """
+        key = BookService._count_key(search)
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = None
+        if search.count_mode == "estimate":
+            estimate = BookService._estimate_count(db, search, query)
+            if estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+                result = (estimate, True)
+        
+        if result is None:
+            result = (query.count(), False)
+        
+        _count_cache.set(key, result)
+        return result
+    
+    @staticmethod
+    def _estimate_count(
+        db: Session,
+        search: BookSearch,
+        query: Query
+    ) -> Optional[int]:
+        # Planner statistics are only available on PostgreSQL
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+        
+        filtered = search.title or search.author_name or search.isbn or search.available_only
+        
+        if not filtered:
+            # Row count kept by VACUUM/ANALYZE (-1 if never analyzed)
+            reltuples = db.execute(text(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = 'books'::regclass"
+            )).scalar()
+            return reltuples if reltuples is not None and reltuples >= 0 else None
+        
+        # Planner's row estimate for the filtered query
+        compiled = query.statement.compile(
+            dialect=bind.dialect,
+            compile_kwargs={"render_postcompile": True}
+        )
+        plan = db.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}",
+            compiled.params
+        ).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+    
+    @staticmethod
+    def get_facets(
+        db: Session,
+        search: BookSearch,
+        facets: List[str]
+    ) -> Dict[str, list]:
+        """
+        Bucket counts over every book matching `search`:
+        - author: top FACET_AUTHOR_LIMIT authors by number of books
+        - availability: available vs. unavailable
+        - year: published_date by decade (null dates -> "unknown")
+        One small aggregate per requested facet; the author top-N is
+        ranked and cut in SQL, with the names joined in the same query.
+        Cached like totals.
+        """
+        key = BookService._count_key(search)[:4] + (tuple(sorted(facets)),)
+        cached = _facet_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        query = BookService._filtered_query(db, search, ranked=False)
+        count = func.count(Book.id).label("count")
+        
+        result: Dict[str, list] = {}
+        
+        if "author" in facets:
+            top = query.with_entities(Book.author_id, count)\
+                .group_by(Book.author_id)\
+                .order_by(count.desc(), Book.author_id)\
+                .limit(settings.FACET_AUTHOR_LIMIT)\
+                .subquery()
+            rows = db.query(top.c.author_id, Author.name, top.c.count)\
+                .join(Author, Author.id == top.c.author_id)\
+                .order_by(top.c.count.desc(), top.c.author_id)\
+                .all()
+            result["author"] = [
+                {"author_id": author_id, "author_name": name, "count": author_count}
+                for author_id, name, author_count in rows
+            ]
+        
+        if "availability" in facets:
+            available = case((Book.available_copies > 0, 1), else_=0)
+            by_availability = {"available": 0, "unavailable": 0}
+            for is_available, value_count in query.with_entities(available, count)\
+                    .group_by(available).all():
+                by_availability["available" if is_available else "unavailable"] += value_count
+            result["availability"] = [
+                {"value": value, "count": value_count}
+                for value, value_count in by_availability.items()
+            ]
+        
+        if "year" in facets:
+            # One row per distinct year; folded into decades here
+            year = extract("year", Book.published_date)
+            by_decade: Dict[Optional[int], int] = {}
+            for published_year, year_count in query.with_entities(year, count)\
+                    .group_by(year).all():
+                decade = int(published_year) // 10 * 10 if published_year is not None else None
+                by_decade[decade] = by_decade.get(decade, 0) + year_count
+            result["year"] = [
+                {
+                    "from": decade,
+                    "to": decade + 9 if decade is not None else None,
+                    "label": f"{decade}s" if decade is not None else "unknown",
+                    "count": decade_count
+                }
+                for decade, decade_count in sorted(
+                    by_decade.items(),
+                    key=lambda item: (item[0] is None, item[0] or 0)
+                )
+            ]
+        
+        _facet_cache.set(key, result)
+        return result
+    
+    @staticmethod
+    def get_books(
+        db: Session,
+        search: BookSearch
+    ) -> Tuple[List[Book], int, bool]:
+       
+        # An explicit sort replaces relevance ranking
+        query = BookService._filtered_query(db, search, ranked=not search.sort)
+        
+        # Get total count before pagination (cached / estimated)
+        total, is_estimate = BookService.count_books(db, search, query)
+        
+        if search.sort:
+            sort_key, column, descending = BookService._sort_spec(search)
+            query = query.order_by(*order_by_keyset(column, Book.id, descending))
         
         # Apply pagination
         skip = (search.page - 1) * search.page_size
         books = query.offset(skip).limit(search.page_size).all()
         
-        return books, total
+        return books, total, is_estimate
+    
+    @staticmethod
+    def get_books_by_cursor(
+        db: Session,
+        search: BookSearch
+    ) -> Tuple[List[Book], Optional[str], Optional[int], bool]:
+        """
+        Keyset pagination: seeks past the cursor's (sort value, id)
+        instead of using OFFSET, so every page costs the same.
+        Returns (books, next_cursor, total, is_estimate); total is None
+        unless search.include_total is set.
+        """
+        # Results are walked in sort (default: id) order, not by relevance
+        query = BookService._filtered_query(db, search, ranked=False)
+        sort_key, column, descending = BookService._sort_spec(search)
+        
+        total, is_estimate = None, False
+        if search.include_total:
+            total, is_estimate = BookService.count_books(db, search, query)
+        
+        if search.cursor:
+            try:
+                last_value, last_id = decode_cursor(search.cursor, sort_key)
+                last_value = BookService._parse_sort_value(db, column, last_value)
+            except (ValueError, TypeError) as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid cursor: {e}"
+                )
+            query = query.filter(keyset_filter(
+                column,
+                Book.id,
+                last_value,
+                last_id,
+                descending=descending,
+                nullable=column.expression.nullable
+            ))
+        
+        # Fetch one extra row to know whether another page exists
+        books = query\
+            .order_by(*order_by_keyset(column, Book.id, descending))\
+            .limit(search.page_size + 1)\
+            .all()
+        
+        next_cursor = None
+        if len(books) > search.page_size:
+            books = books[:search.page_size]
+            last = books[-1]
+            next_cursor = encode_cursor(
+                sort_key,
+                BookService._sort_value(column, last),
+                last.id
+            )
+        
+        return books, next_cursor, total, is_estimate
+    
+    @staticmethod
+    def iter_books(
+        db: Session,
+        search: BookSearch,
+        batch_size: int = 1000
+    ) -> Iterator[Book]:
+        # yield_per streams through a server-side cursor, batch_size rows at a time
+        query = BookService._filtered_query(db, search, ranked=False)
+        return query.order_by(Book.id).yield_per(batch_size)
     
     @staticmethod
     def get_book_by_id(db: Session, book_id: int) -> Book:
-        book = db.query(Book).filter(Book.id == book_id).first()
+        book = db.query(Book)\
+            .options(joinedload(Book.author))\
+            .filter(Book.id == book_id)\
+            .first()
         
         if not book:
             raise HTTPException(
@@ -99,6 +421,96 @@ class BookService:
         
         return book
     
+    @staticmethod
+    def get_books_batch(db: Session, batch: BookBatchRequest) -> BookBatchResponse:
+        """
+        Looks up many books by id and/or ISBN in one query (authors joined).
+        Books come back in request order (ids first, then ISBNs), each book
+        once; keys that matched nothing are listed as missing.
+        """
+        conditions = []
+        if batch.ids:
+            conditions.append(Book.id.in_(batch.ids))
+        if batch.isbns:
+            conditions.append(Book.isbn.in_(batch.isbns))
+        
+        found = db.query(Book)\
+            .options(joinedload(Book.author))\
+            .filter(or_(*conditions))\
+            .all()
+        
+        by_id = {book.id: book for book in found}
+        by_isbn = {book.isbn: book for book in found if book.isbn}
+        
+        ordered = []
+        seen = set()
+        for book in [by_id.get(book_id) for book_id in batch.ids] + \
+                    [by_isbn.get(isbn) for isbn in batch.isbns]:
+            if book is not None and book.id not in seen:
+                seen.add(book.id)
+                ordered.append(BookResponse.model_validate(book))
+        
+        return BookBatchResponse(
+            books=ordered,
+            missing_ids=[book_id for book_id in batch.ids if book_id not in by_id],
+            missing_isbns=[isbn for isbn in batch.isbns if isbn not in by_isbn]
+        )
+    
+    @staticmethod
+    def book_etag(book_id: int, book_version: int, author_version: int) -> str:
+        # BookResponse embeds the author's name, so both versions count
+        return make_etag("book", book_id, book_version, author_version)
+    
+    @staticmethod
+    def page_etag(books: List[Book], *context) -> str:
+        # List ETag: request context plus every row version on the page
+        return make_etag(
+            "books",
+            *context,
+            [(book.id, book.version, book.author.version) for book in books]
+        )
+    
+    @staticmethod
+    def get_book_response(
+        db: Session,
+        book_id: int,
+        current_etag: Optional[str] = None
+    ) -> Tuple[str, BookResponse]:
+        """
+        Returns (etag, response). Read-through cached; 404s are not cached.
+        current_etag (from get_book_etag) drops a cached entry that lags it.
+        """
+        if current_etag is not None:
+            cached = EntityCache.books.peek(book_id)
+            if cached is not None and cached[0] != current_etag:
+                EntityCache.books.invalidate(book_id)
+        
+        def load():
+            book = BookService.get_book_by_id(db, book_id)
+            etag = BookService.book_etag(book.id, book.version, book.author.version)
+            return etag, BookResponse.model_validate(book)
+        
+        return EntityCache.books.get_or_load(book_id, load)
+    
+    @staticmethod
+    def get_book_etag(db: Session, book_id: int) -> Optional[str]:
+        """
+        Current ETag of a book without loading or serializing it,
+        from a version-only primary-key query. Never from the cache:
+        a cached entry can lag a write made by another process, and a
+        304 must reflect the committed row.
+        None if the book doesn't exist.
+        """
+        versions = db.query(Book.version, Author.version)\
+            .join(Author, Book.author_id == Author.id)\
+            .filter(Book.id == book_id)\
+            .first()
+        
+        if versions is None:
+            return None
+        
+        return BookService.book_etag(book_id, *versions)
+    
     @staticmethod
     def update_book(
         db: Session,
@@ -153,13 +565,30 @@ class BookService:
                 detail="Available copies cannot exceed total copies"
             )
         
+        previous_author_id = book.author_id
+        added_copies = available - book.available_copies
+        
         # Apply updates
         for field, value in update_data.items():
             setattr(book, field, value)
         
+        # New copies go to waiting holds before walk-in borrowers
+        allocated = []
+        if added_copies > 0:
+            allocated = HoldService.allocate_copies(db, {book_id: added_copies})
+            book.available_copies -= len(allocated)
+        
         # Save changes
+        OutboxService.book_changed(db, book, "updated")
         db.commit()
-        db.refresh(book)
+        HoldService.notify(allocated)
+        book = BookService._reload_with_author(db, book_id)
+        
+        SearchService.index_book(book)
+        SuggestService.index_title(book.id, book.title)
+        BookService.invalidate_counts()
+        EntityCache.invalidate_book(book_id, book.author_id)
+        EntityCache.authors.invalidate(previous_author_id)
         
         return book
     
@@ -174,22 +603,31 @@ class BookService:
                 detail=f"Book with id {book_id} not found"
             )
         
-        # Check for active borrows
-        active_borrows = [
-            record for record in book.borrow_records 
-            if record.return_date is None
-        ]
+        # Check for active borrows (EXISTS on the partial index, no rows loaded)
+        has_active_borrows = db.query(
+            exists().where(
+                BorrowRecord.book_id == book_id,
+                BorrowRecord.return_date.is_(None)
+            )
+        ).scalar()
         
-        if active_borrows:
+        if has_active_borrows:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete book with active borrow records. All copies must be returned first."
             )
         
-        # Delete book
+        # Delete book (returned borrow records go with it via ON DELETE CASCADE)
+        author_id = book.author_id
         db.delete(book)
+        OutboxService.book_changed(db, book, "deleted")
         db.commit()
         
+        SearchService.remove_book(book_id)
+        SuggestService.remove_book(book_id)
+        BookService.invalidate_counts()
+        EntityCache.invalidate_book(book_id, author_id)
+        
         return {"message": "Book deleted successfully"}
 
 
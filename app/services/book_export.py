@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from typing import Iterator
+
+from app.config import settings
+from app.database import SessionLocal
+from app.schemas.book import BookResponse, BookSearch
+from app.services.book import BookService
+
+
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "isbn",
+    "published_date",
+    "author_id",
+    "author_name",
+    "total_copies",
+    "available_copies",
+    "is_available",
+    "created_at"
+]
+
+
+class BookExportService:
+    """
+    Catalog Export
+    ==============
+    Streams every book matching a search as NDJSON or CSV.
+    Rows come from a server-side cursor in batches of
+    BOOK_EXPORT_BATCH_SIZE, so memory stays flat however
+    large the catalog is.
+    """
+
+    @staticmethod
+    def stream(search: BookSearch, fmt: str) -> Iterator[str]:
+        # Own session: it must stay open until the last row is sent,
+        # which is after the route (and get_db) has returned
+        db = SessionLocal()
+        try:
+            books = BookService.iter_books(db, search, settings.BOOK_EXPORT_BATCH_SIZE)
+            rows = (
+                BookResponse.model_validate(book).model_dump(mode="json")
+                for book in books
+            )
+            if fmt == "csv":
+                yield from BookExportService._csv_lines(rows)
+            else:
+                for row in rows:
+                    yield json.dumps(row) + "\n"
+        finally:
+            db.close()
+
+    @staticmethod
+    def _csv_lines(rows: Iterator[dict]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Header-only export still needs its header flushed
+        if buffer.tell():
+            yield buffer.getvalue()
@@ -1,11 +1,38 @@
+from sqlalchemy import exists, select, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.database import SessionLocal
 from app.models.book import Book
-from app.models.borrow import BorrowRecord, BorrowStatus
+from app.models.borrow import ArchivedBorrowRecord, BorrowRecord, BorrowStatus
 from app.models.user import User
-from app.schemas.borrow import BorrowCreate
+from app.schemas.borrow import (
+    BorrowCreate,
+    BorrowResponse,
+    ReturnBatchRequest,
+    BorrowBatchCreate,
+    BorrowBatchItem,
+    BorrowBatchResponse
+)
+from app.services.book import BookService
+from app.services.entity_cache import EntityCache
+from app.services.hold import HoldService
+from app.services.outbox import OutboxService
+from app.services.rollup import CirculationRollupService
+from app.services.suggest import SuggestService
+from app.utils.pagination import (
+    encode_cursor,
+    decode_cursor,
+    keyset_filter,
+    order_by_keyset,
+    cursor_timestamp
+)
+
+
+HISTORY_SORT_KEY = "-borrow_date"
 
 
 class BorrowService:
@@ -15,35 +42,39 @@ class BorrowService:
         user: User,
         borrow_data: BorrowCreate
     ) -> BorrowRecord:
-        # Find book
-        book = db.query(Book).filter(
-            Book.id == borrow_data.book_id
-        ).first()
-        
-        if not book:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Book with id {borrow_data.book_id} not found"
+        # Check if user already has this book borrowed
+        existing_borrow = db.query(
+            exists().where(
+                BorrowRecord.user_id == user.id,
+                BorrowRecord.book_id == borrow_data.book_id,
+                BorrowRecord.return_date == None  # Not returned yet
             )
+        ).scalar()
         
-        # Check availability
-        if book.available_copies <= 0:
+        if existing_borrow:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Book '{book.title}' is not available for borrowing"
+                detail=f"You already have this book borrowed"
             )
         
-        # Check if user already has this book borrowed
-        existing_borrow = db.query(BorrowRecord).filter(
-            BorrowRecord.user_id == user.id,
-            BorrowRecord.book_id == book.id,
-            BorrowRecord.return_date == None  # Not returned yet
-        ).first()
+        # Check availability and take a copy in one statement:
+        # concurrent borrows can't both see the last copy
+        book = BorrowService._take_copy(db, borrow_data.book_id)
         
-        if existing_borrow:
+        if book is None:
+            title = db.query(Book.title).filter(
+                Book.id == borrow_data.book_id
+            ).scalar()
+            
+            if title is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Book with id {borrow_data.book_id} not found"
+                )
+            
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"You already have this book borrowed"
+                detail=f"Book '{title}' is not available for borrowing. Place a hold via POST /api/v1/holds/ to be notified"
             )
         
         # Calculate due date
@@ -53,18 +84,28 @@ class BorrowService:
         borrow_record = BorrowRecord(
             user_id=user.id,
             book_id=book.id,
+            book_title=book.title,
             due_date=due_date,
             status=BorrowStatus.BORROWED
         )
         
-        # Decrement available copies
-        book.available_copies -= 1
-        
-        # Save to database
+        # Save to database, with the change event and the day's rollup
+        # in the same transaction
         db.add(borrow_record)
+        db.flush()
+        OutboxService.loans_changed(db, [borrow_record], "created")
+        CirculationRollupService.record(
+            db,
+            [(datetime.utcnow().date(), book.id, "borrows")],
+            {book.id: book.author_id}
+        )
         db.commit()
         db.refresh(borrow_record)
         
+        BookService.invalidate_counts(available_only=True)
+        EntityCache.invalidate_book(book.id, book.author_id)
+        SuggestService.record_borrow(book.id, book.author_id)
+        
         return borrow_record
     
     @staticmethod
@@ -87,40 +128,340 @@ class BorrowService:
                 detail="You don't have permission to return this book"
             )
         
+        # Update status (returned or overdue)
+        if borrow_record.is_overdue:
+            returned_status = BorrowStatus.OVERDUE
+        else:
+            returned_status = BorrowStatus.RETURNED
+        
+        # Mark as returned only if still open, so a double submit
+        # can't give the copy back twice
+        returned_at = datetime.utcnow()
+        closed = db.execute(
+            update(BorrowRecord)
+            .where(
+                BorrowRecord.id == record_id,
+                BorrowRecord.return_date == None
+            )
+            .values(return_date=returned_at, status=returned_status)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        
         # Check if already returned
-        if borrow_record.return_date is not None:
+        if not closed:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="This book has already been returned"
             )
         
-        # Mark as returned
-        borrow_record.return_date = datetime.utcnow()
+        # The copy goes to the first hold in line, else back on the shelf
+        allocated = HoldService.allocate_copies(db, {borrow_record.book_id: 1})
+        book = None
+        if not allocated:
+            book = BorrowService._give_back_copy(db, borrow_record.book_id)
         
-        # Update status (returned or overdue)
-        if borrow_record.is_overdue:
-            borrow_record.status = BorrowStatus.OVERDUE
-        else:
-            borrow_record.status = BorrowStatus.RETURNED
-        
-        # Increment available copies
-        book = borrow_record.book
-        book.available_copies += 1
+        OutboxService.loans_changed(
+            db, [borrow_record], "returned",
+            status=returned_status, return_date=returned_at
+        )
+        CirculationRollupService.record(
+            db,
+            BorrowService._return_events(borrow_record, returned_status)
+        )
         
         # Save changes
         db.commit()
         db.refresh(borrow_record)
         
+        HoldService.notify(allocated)
+        if book is not None:
+            BookService.invalidate_counts(available_only=True)
+            EntityCache.invalidate_book(book.id, book.author_id)
+        
         return borrow_record
     
     @staticmethod
-    def get_user_borrow_history(
+    def borrow_books(
         db: Session,
         user: User,
-        page: int = 1,
-        page_size: int = 10,
-        active_only: bool = False
-    ) -> Tuple[List[BorrowRecord], int]:
+        batch: BorrowBatchCreate
+    ) -> BorrowBatchResponse:
+        """
+        Checks out a stack of books in one transaction.
+        Validation is set-based (one query for books, one for open loans),
+        copies are taken with a single conditional UPDATE and the records
+        inserted together, then one commit. Each book gets its own result;
+        a failed item doesn't roll back the others.
+        """
+        results: Dict[int, BorrowBatchItem] = {}
+        
+        def fail(book_id: int, code: int, detail: str) -> None:
+            results[book_id] = BorrowBatchItem(
+                book_id=book_id, success=False, status_code=code, detail=detail
+            )
+        
+        requested = list(dict.fromkeys(batch.book_ids))
+        
+        books = {
+            row.id: row
+            for row in db.query(Book.id, Book.title, Book.author_id)
+            .filter(Book.id.in_(requested))
+        }
+        already_borrowed = {
+            book_id
+            for (book_id,) in db.query(BorrowRecord.book_id).filter(
+                BorrowRecord.user_id == user.id,
+                BorrowRecord.book_id.in_(requested),
+                BorrowRecord.return_date == None
+            )
+        }
+        
+        candidates = []
+        for book_id in requested:
+            if book_id not in books:
+                fail(book_id, status.HTTP_404_NOT_FOUND, f"Book with id {book_id} not found")
+            elif book_id in already_borrowed:
+                fail(book_id, status.HTTP_400_BAD_REQUEST, "You already have this book borrowed")
+            else:
+                candidates.append(book_id)
+        
+        # One conditional decrement for the whole stack
+        taken = set()
+        if candidates:
+            taken = {
+                row.id
+                for row in db.execute(
+                    update(Book)
+                    .where(Book.id.in_(candidates), Book.available_copies > 0)
+                    .values(available_copies=Book.available_copies - 1)
+                    .returning(Book.id)
+                    .execution_options(synchronize_session=False)
+                )
+            }
+        
+        due_date = datetime.utcnow() + timedelta(days=batch.due_days)
+        new_records = []
+        for book_id in candidates:
+            if book_id not in taken:
+                fail(
+                    book_id,
+                    status.HTTP_400_BAD_REQUEST,
+                    f"Book '{books[book_id].title}' is not available for borrowing"
+                )
+                continue
+            new_records.append(BorrowRecord(
+                user_id=user.id,
+                book_id=book_id,
+                book_title=books[book_id].title,
+                due_date=due_date,
+                status=BorrowStatus.BORROWED
+            ))
+        
+        if new_records:
+            db.add_all(new_records)
+            db.flush()
+            OutboxService.loans_changed(db, new_records, "created")
+            today = datetime.utcnow().date()
+            CirculationRollupService.record(
+                db,
+                [(today, record.book_id, "borrows") for record in new_records],
+                {record.book_id: books[record.book_id].author_id for record in new_records}
+            )
+        record_ids = [record.id for record in new_records]
+        db.commit()
+        
+        for record in BorrowService._load_records(db, record_ids):
+            results[record.book_id] = BorrowBatchItem(
+                book_id=record.book_id,
+                success=True,
+                status_code=status.HTTP_201_CREATED,
+                record=BorrowResponse.model_validate(record)
+            )
+        
+        if taken:
+            BookService.invalidate_counts(available_only=True)
+            for book_id in taken:
+                EntityCache.invalidate_book(book_id, books[book_id].author_id)
+                SuggestService.record_borrow(book_id, books[book_id].author_id)
+        
+        return BorrowService._batch_response([results[book_id] for book_id in requested])
+    
+    @staticmethod
+    def return_books(
+        db: Session,
+        user: User,
+        batch: ReturnBatchRequest
+    ) -> BorrowBatchResponse:
+        """
+        Returns several loans in one transaction: one query to load them,
+        one UPDATE per resulting status (returned/overdue), one increment
+        per distinct copy count, one commit. Per-item results as above.
+        """
+        results: Dict[int, BorrowBatchItem] = {}
+        
+        def fail(record_id: int, code: int, detail: str) -> None:
+            results[record_id] = BorrowBatchItem(
+                record_id=record_id, success=False, status_code=code, detail=detail
+            )
+        
+        requested = list(dict.fromkeys(batch.record_ids))
+        
+        records = {
+            record.id: record
+            for record in db.query(BorrowRecord).filter(BorrowRecord.id.in_(requested))
+        }
+        
+        by_status: Dict[BorrowStatus, List[int]] = {}
+        for record_id in requested:
+            record = records.get(record_id)
+            if record is None:
+                fail(record_id, status.HTTP_404_NOT_FOUND, f"Borrow record with id {record_id} not found")
+            elif record.user_id != user.id:
+                fail(record_id, status.HTTP_403_FORBIDDEN, "You don't have permission to return this book")
+            elif record.return_date is not None:
+                fail(record_id, status.HTTP_400_BAD_REQUEST, "This book has already been returned")
+            else:
+                returned_status = BorrowStatus.OVERDUE if record.is_overdue else BorrowStatus.RETURNED
+                by_status.setdefault(returned_status, []).append(record_id)
+        
+        # Close only loans that are still open (same guard as return_book)
+        now = datetime.utcnow()
+        closed: Dict[int, int] = {}
+        for returned_status, record_ids in by_status.items():
+            for row in db.execute(
+                update(BorrowRecord)
+                .where(BorrowRecord.id.in_(record_ids), BorrowRecord.return_date == None)
+                .values(return_date=now, status=returned_status)
+                .returning(BorrowRecord.id, BorrowRecord.book_id)
+                .execution_options(synchronize_session=False)
+            ):
+                closed[row.id] = row.book_id
+        
+        for returned_status, record_ids in by_status.items():
+            OutboxService.loans_changed(
+                db, [records[record_id] for record_id in record_ids if record_id in closed], "returned",
+                status=returned_status, return_date=now
+            )
+        CirculationRollupService.record(db, [
+            event
+            for returned_status, record_ids in by_status.items()
+            for record_id in record_ids
+            if record_id in closed
+            for event in BorrowService._return_events(records[record_id], returned_status)
+        ])
+        
+        # Waiting holds get first pick of the returned copies
+        copies = Counter(closed.values())
+        allocated = HoldService.allocate_copies(db, copies)
+        copies.subtract(allocation.book_id for allocation in allocated)
+        
+        # Give the rest back, grouped by how many came back per book
+        by_count: Dict[int, List[int]] = {}
+        for book_id, count in copies.items():
+            if count > 0:
+                by_count.setdefault(count, []).append(book_id)
+        
+        authors = {}
+        for count, book_ids in by_count.items():
+            for row in db.execute(
+                update(Book)
+                .where(Book.id.in_(book_ids))
+                .values(available_copies=Book.available_copies + count)
+                .returning(Book.id, Book.author_id)
+                .execution_options(synchronize_session=False)
+            ):
+                authors[row.id] = row.author_id
+        
+        db.commit()
+        HoldService.notify(allocated)
+        
+        for record_id in by_status.get(BorrowStatus.OVERDUE, []) + by_status.get(BorrowStatus.RETURNED, []):
+            if record_id not in closed:
+                fail(record_id, status.HTTP_400_BAD_REQUEST, "This book has already been returned")
+        
+        for record in BorrowService._load_records(db, list(closed)):
+            results[record.id] = BorrowBatchItem(
+                record_id=record.id,
+                success=True,
+                status_code=status.HTTP_200_OK,
+                record=BorrowResponse.model_validate(record)
+            )
+        
+        if authors:
+            BookService.invalidate_counts(available_only=True)
+            for book_id, author_id in authors.items():
+                EntityCache.invalidate_book(book_id, author_id)
+        
+        return BorrowService._batch_response([results[record_id] for record_id in requested])
+    
+    @staticmethod
+    def _load_records(db: Session, record_ids: List[int]) -> List[BorrowRecord]:
+        # Committed rows expire; reload them in one query, not one each
+        if not record_ids:
+            return []
+        return db.query(BorrowRecord)\
+            .filter(BorrowRecord.id.in_(record_ids))\
+            .populate_existing()\
+            .all()
+    
+    @staticmethod
+    def _batch_response(results: List[BorrowBatchItem]) -> BorrowBatchResponse:
+        succeeded = sum(1 for item in results if item.success)
+        return BorrowBatchResponse(
+            results=results,
+            succeeded=succeeded,
+            failed=len(results) - succeeded
+        )
+    
+    @staticmethod
+    def _take_copy(db: Session, book_id: int):
+        """
+        UPDATE books SET available_copies = available_copies - 1
+        WHERE id = :id AND available_copies > 0 RETURNING id, title, author_id
+
+        Check and decrement happen in one statement, so there is no
+        read-then-write gap and no retry loop. The row lock it takes is
+        held until the caller's db.commit(); a concurrent borrow of the
+        same book waits for it, then re-evaluates available_copies > 0
+        against the committed value. Returns None when the book is
+        missing or out of copies.
+        """
+        return db.execute(
+            update(Book)
+            .where(Book.id == book_id, Book.available_copies > 0)
+            .values(available_copies=Book.available_copies - 1)
+            .returning(Book.id, Book.title, Book.author_id)
+            .execution_options(synchronize_session=False)
+        ).first()
+    
+    @staticmethod
+    def _return_events(record: BorrowRecord, returned_status: BorrowStatus) -> list:
+        # Rollup events for closing a loan (record still holds its old status);
+        # a loan the overdue sweep already counted isn't counted again
+        events = [(datetime.utcnow().date(), record.book_id, "returns")]
+        if returned_status == BorrowStatus.OVERDUE and record.status != BorrowStatus.OVERDUE:
+            events.append((record.due_date.date(), record.book_id, "overdues"))
+        return events
+    
+    @staticmethod
+    def _give_back_copy(db: Session, book_id: int):
+        # Mirror of _take_copy
+        return db.execute(
+            update(Book)
+            .where(Book.id == book_id)
+            .values(available_copies=Book.available_copies + 1)
+            .returning(Book.id, Book.author_id)
+            .execution_options(synchronize_session=False)
+        ).first()
+    
+    @staticmethod
+    def _history_sources(db: Session, user: User, active_only: bool) -> list:
+        """
+        One query per table holding this user's loans: borrow_records, plus
+        borrow_records_archive unless only active loans are wanted
+        (the archive only holds returned ones).
+        """
         # Base query
         query = db.query(BorrowRecord).filter(
             BorrowRecord.user_id == user.id
@@ -128,41 +469,166 @@ class BorrowService:
         
         # Filter for active only
         if active_only:
-            query = query.filter(BorrowRecord.return_date == None)
+            return [(BorrowRecord, query.filter(BorrowRecord.return_date == None))]
         
-        # Order by most recent first
-        query = query.order_by(BorrowRecord.borrow_date.desc())
+        archived = db.query(ArchivedBorrowRecord).filter(
+            ArchivedBorrowRecord.user_id == user.id
+        )
+        return [(BorrowRecord, query), (ArchivedBorrowRecord, archived)]
+    
+    @staticmethod
+    def _merge_history(sources: list, skip: int, limit: int) -> list:
+        """
+        Newest-first page across hot and archived loans: each table returns
+        its first skip + limit rows in index order, the pages are merged.
+        A returned loan can be archived while an older open one stays hot,
+        so the tables interleave and are not simply concatenated.
+        """
+        rows = []
+        for model, query in sources:
+            rows.extend(
+                query
+                .order_by(*order_by_keyset(model.borrow_date, model.id, descending=True))
+                .limit(skip + limit)
+                .all()
+            )
+        rows.sort(key=lambda record: (record.borrow_date, record.id), reverse=True)
+        return rows[skip:skip + limit]
+    
+    @staticmethod
+    def get_user_borrow_history(
+        db: Session,
+        user: User,
+        page: int = 1,
+        page_size: int = 10,
+        active_only: bool = False
+    ) -> Tuple[List[BorrowRecord], int]:
+        sources = BorrowService._history_sources(db, user, active_only)
         
         # Get total count
-        total = query.count()
+        total = sum(query.count() for _, query in sources)
         
-        # Apply pagination
+        # Most recent first (id breaks ties, matching the indexes)
         skip = (page - 1) * page_size
-        records = query.offset(skip).limit(page_size).all()
+        records = BorrowService._merge_history(sources, skip, page_size)
         
         return records, total
     
     @staticmethod
-    def check_overdue_books(db: Session) -> List[BorrowRecord]:
-        # Find unreturned books past due date
+    def get_user_borrow_history_by_cursor(
+        db: Session,
+        user: User,
+        cursor: Optional[str] = None,
+        page_size: int = 10,
+        active_only: bool = False,
+        include_total: bool = False
+    ) -> Tuple[List[BorrowRecord], Optional[str], Optional[int]]:
+        """
+        Keyset pagination over (borrow_date DESC, id DESC): each page is a
+        seek into ix_borrow_records_user_borrow_date_id (or its active-only
+        partial twin) and the archive's matching index, however deep the
+        reader goes.
+        Returns (records, next_cursor, total); total is None unless asked for.
+        """
+        sources = BorrowService._history_sources(db, user, active_only)
+        
+        total = sum(query.count() for _, query in sources) if include_total else None
+        
+        if cursor:
+            try:
+                last_value, last_id = decode_cursor(cursor, HISTORY_SORT_KEY)
+                last_value = cursor_timestamp(last_value, db.get_bind().dialect.name)
+            except (ValueError, TypeError) as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid cursor: {e}"
+                )
+            sources = [
+                (model, query.filter(keyset_filter(
+                    model.borrow_date,
+                    model.id,
+                    last_value,
+                    last_id,
+                    descending=True
+                )))
+                for model, query in sources
+            ]
+        
+        # Fetch one extra row to know whether another page exists
+        records = BorrowService._merge_history(sources, 0, page_size + 1)
+        
+        next_cursor = None
+        if len(records) > page_size:
+            records = records[:page_size]
+            last = records[-1]
+            next_cursor = encode_cursor(HISTORY_SORT_KEY, last.borrow_date, last.id)
+        
+        return records, next_cursor, total
+    
+    @staticmethod
+    def check_overdue_books(db: Session, chunk_size: Optional[int] = None) -> int:
+        """
+        Marks unreturned loans past their due date as overdue.
+        Set-based and chunked: each round is one
+
+          UPDATE borrow_records SET status = 'overdue'
+          WHERE id IN (SELECT id ... LIMIT :chunk) RETURNING id
+
+        followed by a commit, so no rows are loaded into the session and
+        locks are held for one chunk at a time. Each chunk's overdues go
+        into the change feed and the circulation rollup in the same
+        transaction.
+        Returns the number marked (the ids are in the change feed), so
+        memory stays bounded however large the backlog.
+        """
+        chunk_size = chunk_size or settings.OVERDUE_SWEEP_CHUNK_SIZE
         now = datetime.utcnow()
         
-        overdue_records = db.query(BorrowRecord).filter(
+        # Served by ix_borrow_records_return_due (return_date, due_date)
+        pending = (
             BorrowRecord.return_date == None,  # Not returned
             BorrowRecord.due_date < now,       # Past due date
             BorrowRecord.status != BorrowStatus.OVERDUE  # Not already marked
-        ).all()
-        
-        # Update status to overdue
-        for record in overdue_records:
-            record.status = BorrowStatus.OVERDUE
+        )
         
-        # Save changes
-        if overdue_records:
+        marked = 0
+        while True:
+            chunk = select(BorrowRecord.id).where(*pending).limit(chunk_size)
+            
+            rows = db.execute(
+                update(BorrowRecord)
+                .where(BorrowRecord.id.in_(chunk.scalar_subquery()), *pending)
+                .values(status=BorrowStatus.OVERDUE)
+                .returning(
+                    BorrowRecord.id,
+                    BorrowRecord.book_id,
+                    BorrowRecord.status,
+                    BorrowRecord.due_date,
+                    BorrowRecord.return_date
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+            OutboxService.loans_changed(db, rows, "overdue")
+            CirculationRollupService.record(
+                db,
+                [(row.due_date.date(), row.book_id, "overdues") for row in rows]
+            )
             db.commit()
+            
+            marked += len(rows)
+            if len(rows) < chunk_size:
+                break
         
-        return overdue_records
-
+        return marked
+    
+    @staticmethod
+    def sweep_overdue_books() -> int:
+        # Scheduled entry point: own session, returns the number marked
+        db = SessionLocal()
+        try:
+            return BorrowService.check_overdue_books(db)
+        finally:
+            db.close()
 
 """
 Example: Calculate late fee
@@ -0,0 +1,41 @@
+from typing import Iterable, Optional
+
+from app.config import settings
+from app.utils.cache import ReadThroughCache, make_backend
+
+
+def _backend():
+    return make_backend(
+        settings.ENTITY_CACHE_BACKEND,
+        settings.ENTITY_CACHE_SIZE,
+        settings.ENTITY_CACHE_TTL
+    )
+
+
+class EntityCache:
+    """
+    Single-Entity Cache
+    ===================
+    Read-through caches for serialized single-book (BookResponse) and
+    single-author (AuthorWithBooks) lookups, keyed by id.
+
+    Services invalidate entries after every write that changes what
+    those responses contain. Invalidation is per process; with several
+    workers, ENTITY_CACHE_TTL bounds how stale another worker can be.
+    """
+
+    books = ReadThroughCache("books", _backend())
+    authors = ReadThroughCache("authors", _backend())
+
+    @staticmethod
+    def invalidate_book(book_id: int, author_id: Optional[int] = None) -> None:
+        EntityCache.books.invalidate(book_id)
+        # The author's response embeds its books
+        if author_id is not None:
+            EntityCache.authors.invalidate(author_id)
+
+    @staticmethod
+    def invalidate_author(author_id: int, book_ids: Iterable[int] = ()) -> None:
+        EntityCache.authors.invalidate(author_id)
+        # Book responses embed the author's name
+        EntityCache.books.invalidate(*book_ids)
@@ -0,0 +1,328 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import exists, func, select, tuple_, update
+from sqlalchemy.orm import Session, aliased
+
+from app.database import SessionLocal
+from app.models.book import Book
+from app.models.borrow import BorrowRecord, BorrowStatus
+from app.models.hold import Hold, HoldStatus
+from app.models.user import User
+from app.schemas.hold import HoldCreate, HoldResponse
+from app.services.outbox import OutboxService
+from app.services.rollup import CirculationRollupService
+from app.services.suggest import SuggestService
+
+
+class Allocation(NamedTuple):
+    # Plain values, still readable after the caller commits
+    hold_id: int
+    user_id: int
+    book_id: int
+    author_id: int
+
+
+class HoldNotifier:
+    """
+    Wakes a user's open event streams when one of their holds is filled.
+    Returns run in the threadpool, streams wait on the event loop,
+    so waking goes through loop.call_soon_threadsafe.
+    Per process: streams also re-check the database on every heartbeat.
+    """
+
+    _waiters: Dict[int, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def subscribe(user_id: int) -> asyncio.Event:
+        event = asyncio.Event()
+        with HoldNotifier._lock:
+            HoldNotifier._waiters.setdefault(user_id, set()).add(
+                (asyncio.get_running_loop(), event)
+            )
+        return event
+
+    @staticmethod
+    def unsubscribe(user_id: int, event: asyncio.Event) -> None:
+        with HoldNotifier._lock:
+            waiters = HoldNotifier._waiters.get(user_id, set())
+            for waiter in [w for w in waiters if w[1] is event]:
+                waiters.discard(waiter)
+            if not waiters:
+                HoldNotifier._waiters.pop(user_id, None)
+
+    @staticmethod
+    def notify(user_id: int) -> None:
+        with HoldNotifier._lock:
+            waiters = list(HoldNotifier._waiters.get(user_id, ()))
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+
+class HoldService:
+    @staticmethod
+    def place_hold(db: Session, user: User, hold_data: HoldCreate) -> HoldResponse:
+        # Locked like allocate_copies: a return can't shelve a copy
+        # between this availability check and the hold being queued
+        book = db.query(Book.id, Book.title, Book.available_copies).filter(
+            Book.id == hold_data.book_id
+        ).with_for_update().first()
+
+        if not book:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Book with id {hold_data.book_id} not found"
+            )
+
+        if book.available_copies > 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Book '{book.title}' is available, borrow it instead"
+            )
+
+        already_borrowed = db.query(
+            exists().where(
+                BorrowRecord.user_id == user.id,
+                BorrowRecord.book_id == book.id,
+                BorrowRecord.return_date == None
+            )
+        ).scalar()
+
+        if already_borrowed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You already have this book borrowed"
+            )
+
+        already_waiting = db.query(
+            exists().where(
+                Hold.user_id == user.id,
+                Hold.book_id == book.id,
+                Hold.status == HoldStatus.WAITING
+            )
+        ).scalar()
+
+        if already_waiting:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You already have a hold on this book"
+            )
+
+        hold = Hold(
+            user_id=user.id,
+            book_id=book.id,
+            due_days=hold_data.due_days,
+            status=HoldStatus.WAITING
+        )
+
+        db.add(hold)
+        db.commit()
+
+        return HoldService.get_user_holds(db, user, hold_ids=[hold.id])[0]
+
+    @staticmethod
+    def get_user_holds(
+        db: Session,
+        user: User,
+        active_only: bool = False,
+        hold_ids: List[int] = None
+    ) -> List[HoldResponse]:
+        # Queue position comes from a correlated count, one query for all holds
+        ahead = aliased(Hold)
+        position = select(func.count(ahead.id) + 1).where(
+            ahead.book_id == Hold.book_id,
+            ahead.status == HoldStatus.WAITING,
+            tuple_(ahead.created_at, ahead.id) < tuple_(Hold.created_at, Hold.id)
+        ).scalar_subquery()
+
+        query = db.query(Hold, position).filter(Hold.user_id == user.id)
+        if active_only:
+            query = query.filter(Hold.status == HoldStatus.WAITING)
+        if hold_ids is not None:
+            query = query.filter(Hold.id.in_(hold_ids))
+
+        holds = []
+        for hold, place in query.order_by(Hold.created_at.desc(), Hold.id.desc()):
+            response = HoldResponse.model_validate(hold)
+            if hold.status == HoldStatus.WAITING:
+                response.position = place
+            holds.append(response)
+
+        return holds
+
+    @staticmethod
+    def cancel_hold(db: Session, hold_id: int, user: User) -> dict:
+        hold = db.query(Hold).filter(Hold.id == hold_id).first()
+
+        if not hold:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Hold with id {hold_id} not found"
+            )
+
+        if hold.user_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to cancel this hold"
+            )
+
+        # Conditional: a return may be allocating this hold right now
+        cancelled = db.execute(
+            update(Hold)
+            .where(Hold.id == hold_id, Hold.status == HoldStatus.WAITING)
+            .values(status=HoldStatus.CANCELLED)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+
+        if not cancelled:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only waiting holds can be cancelled"
+            )
+
+        return {"message": "Hold cancelled successfully"}
+
+    @staticmethod
+    def allocate_copies(db: Session, copies: Dict[int, int]) -> List[Allocation]:
+        """
+        Hands returned copies ({book_id: count}) straight to the oldest
+        waiting holds: each gets a new BorrowRecord and is marked fulfilled.
+        Runs inside the caller's transaction; the caller puts back on the
+        shelf only the copies not allocated, commits, then calls notify().
+
+        The book row is locked first, so concurrent returns of the same
+        book take turns at the head of its queue instead of skipping each
+        other's holds. Holders who meanwhile got a copy another way are
+        dropped from the queue and the next in line is tried, until the
+        copies are used up or nobody is waiting.
+        """
+        allocations: List[Allocation] = []
+        now = datetime.utcnow()
+
+        # Fixed lock order (by id) so two batch returns can't deadlock
+        for book_id, count in sorted(copies.items()):
+            if count <= 0:
+                continue
+
+            book = db.query(Book.id, Book.title, Book.author_id)\
+                .filter(Book.id == book_id)\
+                .with_for_update()\
+                .first()
+            if book is None:
+                continue
+
+            remaining = count
+            while remaining > 0:
+                # Every hold fetched leaves WAITING below, so each round moves on
+                queue = db.query(Hold)\
+                    .filter(Hold.book_id == book_id, Hold.status == HoldStatus.WAITING)\
+                    .order_by(Hold.created_at, Hold.id)\
+                    .limit(remaining)\
+                    .with_for_update()\
+                    .all()
+                if not queue:
+                    break
+
+                borrowing = {
+                    user_id
+                    for (user_id,) in db.query(BorrowRecord.user_id).filter(
+                        BorrowRecord.book_id == book_id,
+                        BorrowRecord.user_id.in_([hold.user_id for hold in queue]),
+                        BorrowRecord.return_date == None
+                    )
+                }
+
+                served = []
+                for hold in queue:
+                    if hold.user_id in borrowing:
+                        hold.status = HoldStatus.CANCELLED
+                    else:
+                        served.append(hold)
+
+                records = [
+                    BorrowRecord(
+                        user_id=hold.user_id,
+                        book_id=book_id,
+                        book_title=book.title,
+                        due_date=now + timedelta(days=hold.due_days),
+                        status=BorrowStatus.BORROWED
+                    )
+                    for hold in served
+                ]
+                db.add_all(records)
+                db.flush()
+                OutboxService.loans_changed(db, records, "created")
+
+                for hold, record in zip(served, records):
+                    hold.status = HoldStatus.FULFILLED
+                    hold.fulfilled_at = now
+                    hold.borrow_record_id = record.id
+                    allocations.append(Allocation(hold.id, hold.user_id, book_id, book.author_id))
+                db.flush()
+                
+                CirculationRollupService.record(
+                    db,
+                    [(now.date(), book_id, "borrows")] * len(records),
+                    {book_id: book.author_id}
+                )
+
+                remaining -= len(served)
+
+        return allocations
+
+    @staticmethod
+    def notify(allocations: List[Allocation]) -> None:
+        # Call after commit, so woken streams can see the fulfilled holds
+        for allocation in allocations:
+            SuggestService.record_borrow(allocation.book_id, allocation.author_id)
+        for user_id in {allocation.user_id for allocation in allocations}:
+            HoldNotifier.notify(user_id)
+
+    @staticmethod
+    def fulfilled_since(
+        user_id: int,
+        since: Optional[datetime] = None,
+        last_event_id: Optional[int] = None
+    ) -> List[HoldResponse]:
+        """
+        Fulfilled holds to push to an event stream, oldest first.
+        - since: after this fulfilled_at (the stream's own position)
+        - last_event_id: after that hold (EventSource reconnect)
+        - neither: holds whose loan is still open, so a fill that happened
+          before the stream connected is still delivered
+        Short-lived session: event streams must not pin a pooled connection.
+        """
+        db = SessionLocal()
+        try:
+            query = db.query(Hold).filter(
+                Hold.user_id == user_id,
+                Hold.status == HoldStatus.FULFILLED
+            )
+
+            if since is None and last_event_id is not None:
+                since = db.query(Hold.fulfilled_at).filter(
+                    Hold.id == last_event_id,
+                    Hold.user_id == user_id
+                ).scalar()
+
+            if since is not None:
+                query = query.filter(Hold.fulfilled_at > since)
+            else:
+                query = query.filter(
+                    Hold.borrow_record_id.in_(
+                        select(BorrowRecord.id).where(
+                            BorrowRecord.user_id == user_id,
+                            BorrowRecord.return_date == None
+                        )
+                    )
+                )
+
+            holds = query.order_by(Hold.fulfilled_at, Hold.id).all()
+            return [HoldResponse.model_validate(hold) for hold in holds]
+        finally:
+            db.close()
@@ -0,0 +1,222 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.idempotency import IdempotencyKey
+
+
+def _utc(value: datetime) -> datetime:
+    # Naive UTC, whether the driver returned an aware or a naive value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class IdempotencyService:
+    """
+    Idempotency-Key Support
+    =======================
+    A client that retries a POST sends the same Idempotency-Key header.
+    The first request reserves (user, key) - one row, committed before
+    the work starts - and stores its response when done. Retries are
+    answered from that row with a single primary-key lookup:
+
+      finished       -> stored status + body, Idempotent-Replayed: true
+      still running  -> 409 (retry later)
+      other payload  -> 422 (a key belongs to one request)
+
+    Client errors (4xx) are stored like successes; server errors release
+    the key so the retry runs again. A reservation left behind by a
+    crashed worker can be taken over after IDEMPOTENCY_LOCK_TIMEOUT.
+    Expired keys are deleted by the idempotency_cleanup job.
+    """
+
+    @staticmethod
+    def fingerprint(method: str, path: str, body: BaseModel) -> str:
+        payload = f"{method} {path}\n{body.model_dump_json()}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def run(
+        db: Session,
+        user_id: int,
+        key: Optional[str],
+        method: str,
+        path: str,
+        body: BaseModel,
+        handler: Callable[[], Any],
+        status_code: int = status.HTTP_200_OK
+    ) -> Any:
+        """
+        Runs handler() once per key; its return value must be
+        JSON-encodable (a response model). Without a key, just runs it.
+        """
+        if key is None:
+            return handler()
+
+        fingerprint = IdempotencyService.fingerprint(method, path, body)
+        stored = IdempotencyService._reserve(db, user_id, key, method, path, fingerprint)
+        if stored is not None:
+            return stored
+
+        try:
+            result = handler()
+        except HTTPException as exc:
+            db.rollback()
+            if exc.status_code >= 500:
+                IdempotencyService._release(db, user_id, key)
+            else:
+                IdempotencyService._complete(db, user_id, key, exc.status_code, {"detail": exc.detail})
+            raise
+        except Exception:
+            db.rollback()
+            IdempotencyService._release(db, user_id, key)
+            raise
+
+        IdempotencyService._complete(db, user_id, key, status_code, jsonable_encoder(result))
+        return result
+
+    @staticmethod
+    def _reserve(
+        db: Session,
+        user_id: int,
+        key: str,
+        method: str,
+        path: str,
+        fingerprint: str
+    ) -> Optional[JSONResponse]:
+        # None: this request owns the key and should run
+        now = datetime.utcnow()
+
+        for _ in range(2):
+            record = db.get(IdempotencyKey, (user_id, key), populate_existing=True)
+
+            if record is not None and _utc(record.expires_at) <= now:
+                # Expired, not yet cleaned up: start over
+                IdempotencyService._release(db, user_id, key, expires_before=now)
+                record = None
+
+            if record is None:
+                db.add(IdempotencyKey(
+                    user_id=user_id,
+                    key=key,
+                    method=method,
+                    path=path,
+                    fingerprint=fingerprint,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+                ))
+                try:
+                    db.commit()
+                    return None
+                except IntegrityError:
+                    # A concurrent retry reserved it first
+                    db.rollback()
+                    continue
+
+            if record.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used for a different request"
+                )
+
+            if record.status_code is not None:
+                return JSONResponse(
+                    status_code=record.status_code,
+                    content=record.response_body,
+                    headers={"Idempotent-Replayed": "true"}
+                )
+
+            # Still running - unless its worker died holding the key
+            stale_before = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+            if _utc(record.created_at) < stale_before:
+                taken = db.execute(
+                    update(IdempotencyKey)
+                    .where(
+                        IdempotencyKey.user_id == user_id,
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.status_code == None,
+                        IdempotencyKey.created_at == record.created_at
+                    )
+                    .values(created_at=now)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                if taken:
+                    return None
+            break
+
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still in progress, retry later"
+        )
+
+    @staticmethod
+    def _complete(db: Session, user_id: int, key: str, status_code: int, body: Any) -> None:
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(status_code=status_code, response_body=body)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    @staticmethod
+    def _release(
+        db: Session,
+        user_id: int,
+        key: str,
+        expires_before: Optional[datetime] = None
+    ) -> None:
+        statement = delete(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key
+        )
+        if expires_before is not None:
+            statement = statement.where(IdempotencyKey.expires_at <= expires_before)
+        db.execute(statement.execution_options(synchronize_session=False))
+        db.commit()
+
+    @staticmethod
+    def delete_expired(db: Session, batch_size: Optional[int] = None) -> int:
+        # Batched like the borrow archive; returns the number of keys deleted
+        batch_size = batch_size or settings.IDEMPOTENCY_CLEANUP_BATCH_SIZE
+        now = datetime.utcnow()
+
+        deleted = 0
+        while True:
+            # Served by ix_idempotency_keys_expires_at
+            batch = select(IdempotencyKey.user_id, IdempotencyKey.key)\
+                .where(IdempotencyKey.expires_at <= now)\
+                .limit(batch_size)
+            count = db.execute(
+                delete(IdempotencyKey)
+                .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(batch))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+
+            deleted += count
+            if count < batch_size:
+                break
+
+        return deleted
+
+    @staticmethod
+    def run_cleanup() -> int:
+        # Scheduled entry point: own session
+        db = SessionLocal()
+        try:
+            return IdempotencyService.delete_expired(db)
+        finally:
+            db.close()
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.change import ChangeEvent
+from app.schemas.change import ChangeEventResponse
+
+
+# (entity, entity_id, op, payload)
+Change = Tuple[str, int, str, Optional[dict]]
+
+BOOK_FIELDS = ("title", "author_id", "isbn", "published_date", "total_copies", "available_copies")
+AUTHOR_FIELDS = ("name", "bio")
+# No user_id: the feed is readable by any authenticated client
+LOAN_FIELDS = ("book_id", "status", "due_date", "return_date")
+
+
+class OutboxService:
+    """
+    Transactional Outbox and Change Feed
+    ====================================
+    Book, author and loan mutations add ChangeEvent rows in their own
+    transaction (before commit), so the feed has an event for every
+    committed change and none for rolled-back ones. Consumers tail the
+    feed by sequence number (GET /api/v1/changes?since=N) - a primary-key
+    range scan - instead of re-reading the catalog.
+
+    Sequence numbers are handed out at insert time, not at commit, so a
+    slow transaction can commit a lower id after a higher one was already
+    served. Events younger than CHANGE_FEED_SETTLE_SECONDS are held back
+    so readers don't move past such a gap.
+    """
+
+    @staticmethod
+    def payload(obj, fields: Iterable[str]) -> dict:
+        return jsonable_encoder({field: getattr(obj, field) for field in fields})
+
+    @staticmethod
+    def record(db: Session, changes: List[Change]) -> None:
+        # Adds the events to the caller's transaction; the caller commits
+        if not changes:
+            return
+        # Insert time, not transaction start: what the settle delay measures from
+        now = datetime.utcnow()
+        db.execute(
+            insert(ChangeEvent),
+            [
+                {"entity": entity, "entity_id": entity_id, "op": op, "payload": payload, "created_at": now}
+                for entity, entity_id, op, payload in changes
+            ]
+        )
+
+    @staticmethod
+    def book_changed(db: Session, book, op: str) -> None:
+        payload = None if op == "deleted" else OutboxService.payload(book, BOOK_FIELDS)
+        OutboxService.record(db, [("book", book.id, op, payload)])
+
+    @staticmethod
+    def author_changed(db: Session, author, op: str) -> None:
+        payload = None if op == "deleted" else OutboxService.payload(author, AUTHOR_FIELDS)
+        OutboxService.record(db, [("author", author.id, op, payload)])
+
+    @staticmethod
+    def loans_changed(db: Session, records, op: str, **values) -> None:
+        # values: columns changed by a bulk UPDATE the records don't reflect yet
+        changes = []
+        for record in records:
+            payload = OutboxService.payload(record, LOAN_FIELDS)
+            payload.update(jsonable_encoder(values))
+            changes.append(("loan", record.id, op, payload))
+        OutboxService.record(db, changes)
+
+    @staticmethod
+    def changes_since(
+        db: Session,
+        since: int,
+        limit: int,
+        entity: Optional[str] = None
+    ) -> Tuple[List[ChangeEvent], int, bool]:
+        """
+        Returns (events, next_since, has_more) for events after `since`.
+        next_since is where the next poll starts; it can move past
+        events filtered out by `entity`.
+        """
+        query = db.query(ChangeEvent).filter(ChangeEvent.id > since)
+        if entity is not None:
+            query = query.filter(ChangeEvent.entity == entity)
+
+        rows = query.order_by(ChangeEvent.id).limit(limit + 1).all()
+
+        # Stop at the first event that hasn't settled yet
+        settled_before = datetime.utcnow() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+        events = []
+        for row in rows:
+            created_at = row.created_at
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+            if created_at > settled_before:
+                break
+            events.append(row)
+
+        has_more = len(events) > limit
+        events = events[:limit]
+        next_since = events[-1].id if events else since
+
+        return events, next_since, has_more
+
+    @staticmethod
+    def poll(
+        since: int,
+        limit: int,
+        entity: Optional[str] = None
+    ) -> Tuple[List[ChangeEventResponse], int, bool]:
+        # Short-lived session for event streams (see HoldService.fulfilled_since)
+        db = SessionLocal()
+        try:
+            events, next_since, has_more = OutboxService.changes_since(db, since, limit, entity)
+            return [ChangeEventResponse.model_validate(event) for event in events], next_since, has_more
+        finally:
+            db.close()
+
+    @staticmethod
+    def prune(db: Session, batch_size: int = 1000) -> int:
+        # Deletes events older than CHANGE_FEED_RETENTION_DAYS, oldest first
+        if settings.CHANGE_FEED_RETENTION_DAYS <= 0:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(days=settings.CHANGE_FEED_RETENTION_DAYS)
+
+        deleted = 0
+        while True:
+            # Old events sit at the head of the primary key
+            batch = select(ChangeEvent.id)\
+                .where(ChangeEvent.created_at < cutoff)\
+                .order_by(ChangeEvent.id)\
+                .limit(batch_size)
+            count = db.execute(
+                delete(ChangeEvent)
+                .where(ChangeEvent.id.in_(batch.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+
+            deleted += count
+            if count < batch_size:
+                break
+
+        return deleted
+
+    @staticmethod
+    def run_prune() -> int:
+        # Scheduled entry point: own session
+        db = SessionLocal()
+        try:
+            return OutboxService.prune(db)
+        finally:
+            db.close()
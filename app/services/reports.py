@@ -0,0 +1,240 @@
+import csv
+import io
+from datetime import date, datetime
+from typing import Dict, Iterator, List
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select, union_all
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.book import Book
+from app.models.borrow import ArchivedBorrowRecord, BorrowRecord
+from app.models.user import User
+
+
+REPORTS = ("loans", "books", "users", "overdue")
+
+# Days-late buckets for the overdue distribution: [lower, next lower)
+OVERDUE_BUCKETS = np.array([1, 8, 15, 31, 61])
+OVERDUE_LABELS = ["on time", "1-7", "8-14", "15-30", "31-60", "61+"]
+
+SECONDS_PER_DAY = 86400.0
+
+
+class _Totals:
+    """
+    Per-id running sums kept in NumPy arrays indexed by id, grown as
+    larger ids show up. Each chunk is folded in with one bincount per sum.
+    """
+
+    FIELDS = ("loans", "late_loans", "days_late", "fees")
+
+    def __init__(self):
+        self.sums = {name: np.zeros(0) for name in self.FIELDS}
+
+    def add(self, ids: np.ndarray, days_late: np.ndarray, fees: np.ndarray) -> None:
+        size = max(int(ids.max()) + 1, len(self.sums["loans"]))
+        weights = {
+            "loans": None,
+            "late_loans": (days_late > 0).astype(float),
+            "days_late": days_late,
+            "fees": fees
+        }
+        for name in self.FIELDS:
+            counts = np.bincount(ids, weights=weights[name], minlength=size).astype(float)
+            counts[:len(self.sums[name])] += self.sums[name]
+            self.sums[name] = counts
+
+    def rows(self) -> Iterator[tuple]:
+        loans = self.sums["loans"]
+        for index in np.nonzero(loans)[0]:
+            yield (
+                int(index),
+                int(loans[index]),
+                int(self.sums["late_loans"][index]),
+                int(self.sums["days_late"][index]),
+                round(float(self.sums["fees"][index]), 2)
+            )
+
+
+class CirculationReportService:
+    """
+    Late Fees and Circulation Reports
+    =================================
+    Loans borrowed in [start, end) - hot and archived - are read as plain
+    numeric columns (ids, epoch seconds) in chunks of REPORT_CHUNK_SIZE
+    rows. Days late and fees are computed per chunk with NumPy array
+    operations, per-book/per-user totals folded in with bincount, and
+    the result streamed as CSV. Memory is bounded by the chunk size plus
+    one small array per aggregated id.
+
+    Fee rule: whole days past due (returned loans: up to return_date,
+    open loans: up to now) times LATE_FEE_PER_DAY, capped at
+    LATE_FEE_MAX when that is set.
+    """
+
+    @staticmethod
+    def _epoch(column, dialect_name: str):
+        # Seconds since 1970 as a float, NULL stays NULL
+        if dialect_name == "postgresql":
+            return cast(func.extract("epoch", column), Float)
+        return cast(func.strftime("%s", column), Float)
+
+    @staticmethod
+    def _loans_statement(dialect_name: str, start: date, end: date):
+        epoch = lambda column: CirculationReportService._epoch(column, dialect_name)
+        selects = []
+        for model in (BorrowRecord, ArchivedBorrowRecord):
+            selects.append(
+                select(
+                    model.id,
+                    model.book_id,
+                    model.user_id,
+                    epoch(model.borrow_date).label("borrowed"),
+                    epoch(model.due_date).label("due"),
+                    epoch(model.return_date).label("returned")
+                ).where(
+                    model.borrow_date >= datetime.combine(start, datetime.min.time()),
+                    model.borrow_date < datetime.combine(end, datetime.min.time())
+                )
+            )
+        return union_all(*selects)
+
+    @staticmethod
+    def _chunks(db: Session, start: date, end: date) -> Iterator[Dict[str, np.ndarray]]:
+        dialect_name = db.get_bind().dialect.name
+        statement = CirculationReportService._loans_statement(dialect_name, start, end)
+        result = db.execute(
+            statement.execution_options(yield_per=settings.REPORT_CHUNK_SIZE)
+        )
+        for rows in result.partitions():
+            ids, book_ids, user_ids, borrowed, due, returned = zip(*rows)
+            yield {
+                "id": np.array(ids, dtype=np.int64),
+                "book_id": np.array(book_ids, dtype=np.int64),
+                "user_id": np.array(user_ids, dtype=np.int64),
+                "borrowed": np.array(borrowed, dtype=float),
+                "due": np.array(due, dtype=float),
+                # None -> nan: the loan is still open
+                "returned": np.array(returned, dtype=float)
+            }
+
+    @staticmethod
+    def compute_fees(chunk: Dict[str, np.ndarray], as_of: float) -> Dict[str, np.ndarray]:
+        # Vectorized fee rule for one chunk -> days_late, fees
+        end = np.where(np.isnan(chunk["returned"]), as_of, chunk["returned"])
+        days_late = np.floor((end - chunk["due"]) / SECONDS_PER_DAY)
+        days_late = np.clip(days_late, 0, None)
+
+        fees = days_late * settings.LATE_FEE_PER_DAY
+        if settings.LATE_FEE_MAX > 0:
+            fees = np.minimum(fees, settings.LATE_FEE_MAX)
+
+        return {"days_late": days_late, "fees": fees}
+
+    @staticmethod
+    def stream(report: str, start: date, end: date) -> Iterator[str]:
+        # Own session: it must stay open until the last row is sent
+        db = SessionLocal()
+        try:
+            as_of = (datetime.utcnow() - datetime(1970, 1, 1)).total_seconds()
+            chunks = CirculationReportService._chunks(db, start, end)
+
+            if report == "loans":
+                yield from CirculationReportService._loan_lines(chunks, as_of)
+            elif report == "overdue":
+                yield from CirculationReportService._overdue_lines(chunks, as_of)
+            else:
+                key = "book_id" if report == "books" else "user_id"
+                totals = _Totals()
+                for chunk in chunks:
+                    fees = CirculationReportService.compute_fees(chunk, as_of)
+                    totals.add(chunk[key], fees["days_late"], fees["fees"])
+                yield from CirculationReportService._total_lines(db, report, totals)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _csv(rows: List[tuple]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _loan_lines(chunks, as_of: float) -> Iterator[str]:
+        yield CirculationReportService._csv([
+            ("record_id", "book_id", "user_id", "borrow_date", "due_date", "return_date", "days_late", "fee")
+        ])
+        for chunk in chunks:
+            fees = CirculationReportService.compute_fees(chunk, as_of)
+            dates = {
+                name: np.datetime_as_string(
+                    np.where(np.isnan(chunk[name]), 0, chunk[name]).astype("datetime64[s]")
+                )
+                for name in ("borrowed", "due", "returned")
+            }
+            open_loans = np.isnan(chunk["returned"])
+            yield CirculationReportService._csv([
+                (
+                    int(chunk["id"][i]),
+                    int(chunk["book_id"][i]),
+                    int(chunk["user_id"][i]),
+                    dates["borrowed"][i],
+                    dates["due"][i],
+                    "" if open_loans[i] else dates["returned"][i],
+                    int(fees["days_late"][i]),
+                    round(float(fees["fees"][i]), 2)
+                )
+                for i in range(len(chunk["id"]))
+            ])
+
+    @staticmethod
+    def _overdue_lines(chunks, as_of: float) -> Iterator[str]:
+        loans = np.zeros(len(OVERDUE_LABELS))
+        fees_total = np.zeros(len(OVERDUE_LABELS))
+        for chunk in chunks:
+            fees = CirculationReportService.compute_fees(chunk, as_of)
+            bucket = np.searchsorted(OVERDUE_BUCKETS, fees["days_late"], side="right")
+            loans += np.bincount(bucket, minlength=len(OVERDUE_LABELS))
+            fees_total += np.bincount(bucket, weights=fees["fees"], minlength=len(OVERDUE_LABELS))
+
+        yield CirculationReportService._csv(
+            [("days_late", "loans", "fees")] + [
+                (label, int(loans[i]), round(float(fees_total[i]), 2))
+                for i, label in enumerate(OVERDUE_LABELS)
+            ]
+        )
+
+    @staticmethod
+    def _total_lines(db: Session, report: str, totals: _Totals) -> Iterator[str]:
+        if report == "books":
+            header = ("book_id", "title", "loans", "late_loans", "days_late", "fees")
+            name_column, id_column = Book.title, Book.id
+        else:
+            header = ("user_id", "username", "loans", "late_loans", "days_late", "fees")
+            name_column, id_column = User.username, User.id
+        yield CirculationReportService._csv([header])
+
+        # Names looked up one batch of output rows at a time
+        batch = []
+        for row in totals.rows():
+            batch.append(row)
+            if len(batch) >= settings.REPORT_CHUNK_SIZE:
+                yield CirculationReportService._named_lines(db, batch, name_column, id_column)
+                batch = []
+        if batch:
+            yield CirculationReportService._named_lines(db, batch, name_column, id_column)
+
+    @staticmethod
+    def _named_lines(db: Session, batch: List[tuple], name_column, id_column) -> str:
+        names = dict(
+            db.query(id_column, name_column)
+            .filter(id_column.in_([row[0] for row in batch]))
+            .all()
+        )
+        return CirculationReportService._csv([
+            (row[0], names.get(row[0], "")) + row[1:]
+            for row in batch
+        ])
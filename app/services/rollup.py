@@ -0,0 +1,212 @@
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.book import Book
+from app.models.borrow import ArchivedBorrowRecord, BorrowRecord, BorrowStatus
+from app.models.circulation import CirculationDaily
+
+
+METRICS = ("borrows", "returns", "overdues")
+
+# (day, book_id, metric)
+Event = Tuple[date, int, str]
+
+
+class CirculationRollupService:
+    """
+    Circulation Rollups
+    ===================
+    circulation_daily holds borrows/returns/overdues per book per day.
+    Writers add their events inside their own transaction (one upsert
+    statement), so the rollup commits or rolls back with the loan change.
+    Reports read only the rollup: a date range is a scan of days, not of
+    every loan joined to books and authors.
+
+    Day semantics (shared by record() and rebuild()):
+      borrows  -> day of borrow_date
+      returns  -> day of return_date
+      overdues -> day of due_date, once per loan that went overdue
+    """
+
+    @staticmethod
+    def record(
+        db: Session,
+        events: Iterable[Event],
+        authors: Optional[Dict[int, int]] = None
+    ) -> None:
+        # Adds events to the rollup; the caller commits
+        counts: Dict[Tuple[date, int], Dict[str, int]] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+        for day, book_id, metric in events:
+            counts[(day, book_id)][metric] += 1
+        if not counts:
+            return
+
+        authors = dict(authors or {})
+        missing = {book_id for _, book_id in counts if book_id not in authors}
+        if missing:
+            authors.update(
+                db.query(Book.id, Book.author_id).filter(Book.id.in_(missing)).all()
+            )
+
+        rows = [
+            {"day": day, "book_id": book_id, "author_id": authors.get(book_id), **metrics}
+            for (day, book_id), metrics in counts.items()
+        ]
+        CirculationRollupService._upsert(db, rows)
+
+    @staticmethod
+    def _upsert(db: Session, rows: List[dict]) -> None:
+        # INSERT ... ON CONFLICT (day, book_id) DO UPDATE SET n = n + excluded.n
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        table = CirculationDaily.__table__
+        statement = dialect.insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.day, table.c.book_id],
+            set_={
+                "author_id": func.coalesce(statement.excluded.author_id, table.c.author_id),
+                **{metric: table.c[metric] + statement.excluded[metric] for metric in METRICS}
+            }
+        )
+        db.execute(statement, rows)
+
+    @staticmethod
+    def rebuild(db: Session, start: date, end: date) -> int:
+        """
+        Recomputes [start, end) from borrow_records and the archive
+        (for backfills, or after changing the day semantics).
+        Returns the number of rollup rows written.
+        """
+        start_at = datetime.combine(start, datetime.min.time())
+        end_at = datetime.combine(end, datetime.min.time())
+
+        events = []
+        for model in (BorrowRecord, ArchivedBorrowRecord):
+            for metric, column, condition in (
+                ("borrows", model.borrow_date, None),
+                ("returns", model.return_date, None),
+                ("overdues", model.due_date, model.status == BorrowStatus.OVERDUE)
+            ):
+                query = select(
+                    func.date(column).label("day"),
+                    model.book_id.label("book_id"),
+                    *[literal(1 if name == metric else 0).label(name) for name in METRICS]
+                ).where(column >= start_at, column < end_at)
+                if condition is not None:
+                    query = query.where(condition)
+                events.append(query)
+
+        combined = union_all(*events).subquery()
+        aggregated = select(
+            combined.c.day,
+            combined.c.book_id,
+            Book.author_id,
+            *[func.sum(combined.c[name]).label(name) for name in METRICS]
+        ).select_from(
+            combined.outerjoin(Book, Book.id == combined.c.book_id)
+        ).group_by(combined.c.day, combined.c.book_id, Book.author_id)
+
+        db.execute(
+            delete(CirculationDaily).where(
+                CirculationDaily.day >= start,
+                CirculationDaily.day < end
+            )
+        )
+        written = db.execute(
+            insert(CirculationDaily).from_select(
+                ["day", "book_id", "author_id", *METRICS],
+                aggregated
+            )
+        ).rowcount
+        db.commit()
+
+        return written
+
+    @staticmethod
+    def top(
+        db: Session,
+        metric: str,
+        group: str,
+        start: date,
+        end: date,
+        limit: int
+    ) -> List[dict]:
+        key = CirculationDaily.book_id if group == "book" else CirculationDaily.author_id
+        total = func.sum(getattr(CirculationDaily, metric)).label("total")
+
+        rows = db.query(key, total)\
+            .filter(CirculationDaily.day >= start, CirculationDaily.day < end)\
+            .filter(key.isnot(None))\
+            .group_by(key)\
+            .having(total > 0)\
+            .order_by(total.desc(), key)\
+            .limit(limit)\
+            .all()
+
+        return [{f"{group}_id": row[0], metric: int(row[1])} for row in rows]
+
+    @staticmethod
+    def time_series(
+        db: Session,
+        start: date,
+        end: date,
+        book_id: Optional[int] = None,
+        author_id: Optional[int] = None
+    ) -> List[dict]:
+        query = db.query(
+            CirculationDaily.day,
+            *[func.sum(getattr(CirculationDaily, metric)).label(metric) for metric in METRICS]
+        ).filter(CirculationDaily.day >= start, CirculationDaily.day < end)
+
+        if book_id is not None:
+            query = query.filter(CirculationDaily.book_id == book_id)
+        if author_id is not None:
+            query = query.filter(CirculationDaily.author_id == author_id)
+
+        by_day = {
+            row.day: row
+            for row in query.group_by(CirculationDaily.day).all()
+        }
+
+        # One point per day, zeros included
+        series = []
+        day = start
+        while day < end:
+            row = by_day.get(day)
+            series.append({
+                "day": day,
+                **{metric: int(getattr(row, metric)) if row else 0 for metric in METRICS}
+            })
+            day += timedelta(days=1)
+        return series
+
+
+def main() -> None:
+    # python -m app.services.rollup rebuild --start 2025-01-01 [--end 2026-01-01]
+    parser = argparse.ArgumentParser(description="Circulation rollup maintenance")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today() + timedelta(days=1))
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        # A month per transaction keeps each rebuild step bounded
+        current = args.start
+        while current < args.end:
+            step_end = min(args.end, current + timedelta(days=31))
+            written = CirculationRollupService.rebuild(db, current, step_end)
+            print(f"📈 {current} .. {step_end}: {written} rollup rows")
+            current = step_end
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
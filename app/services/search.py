@@ -0,0 +1,331 @@
+import re
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, case, func, or_, select
+from sqlalchemy.orm import Query, Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.author import Author
+from app.models.book import Book
+from app.schemas.book import BookSearch
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    # Lowercase and collapse punctuation/whitespace to single spaces
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    # Pad like pg_trgm so word starts/ends produce their own trigrams
+    padded = f"  {normalize(text)} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """
+    In-process trigram inverted index
+    =================================
+    Maps every trigram to the set of keys whose text contains it,
+    so a search only touches the postings of the query's trigrams
+    instead of every row.
+    """
+
+    def __init__(self):
+        self._texts: Dict[int, str] = {}
+        self._grams: Dict[int, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, key: int, text: str) -> None:
+        with self._lock:
+            self._discard(key)
+            grams = trigrams(text)
+            self._texts[key] = normalize(text)
+            self._grams[key] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._texts.clear()
+            self._grams.clear()
+            self._postings.clear()
+
+    def search(
+        self,
+        query: str,
+        threshold: float,
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Returns (key, score) pairs ordered by relevance.
+
+        A key matches if its text contains the query as a substring
+        (same as ILIKE '%query%') or its trigram similarity to the
+        query is at least `threshold` (same as pg_trgm's `%`).
+        """
+        needle = normalize(query)
+        query_grams = trigrams(query)
+
+        with self._lock:
+            # Count shared trigrams per candidate using the postings only
+            shared: Counter = Counter()
+            for gram in query_grams:
+                shared.update(self._postings.get(gram, ()))
+
+            # Substring candidates must contain every trigram of the needle
+            inner = {needle[i:i + 3] for i in range(len(needle) - 2)}
+            if not needle:
+                substring_keys: Set[int] = set()
+            elif inner:
+                postings = sorted(
+                    (self._postings.get(gram, set()) for gram in inner),
+                    key=len
+                )
+                substring_keys = set(postings[0]).intersection(*postings[1:])
+            else:
+                # Needle shorter than a trigram: nothing to narrow by
+                substring_keys = set(self._texts)
+
+            results = []
+            for key in substring_keys | set(shared):
+                grams = self._grams[key]
+                common = shared.get(key, 0)
+                score = common / (len(grams) + len(query_grams) - common)
+                if key in substring_keys and needle in self._texts[key]:
+                    results.append((key, score))
+                elif score >= threshold:
+                    results.append((key, score))
+
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit] if limit else results
+
+    def _discard(self, key: int) -> None:
+        grams = self._grams.pop(key, None)
+        self._texts.pop(key, None)
+        if not grams:
+            return
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[gram]
+
+
+class SearchService:
+    """
+    Book Search
+    ===========
+    Substring and fuzzy matching on book titles and author names.
+
+    - PostgreSQL: pg_trgm GIN indexes (ix_books_title_trgm,
+      ix_authors_name_trgm) serve both ILIKE '%x%' and the `%`
+      similarity operator, ranked by similarity().
+    - Other databases (SQLite): an in-process TrigramIndex per
+      column, built on first use and kept up to date by the
+      book and author services.
+
+    The in-process index is per worker process: a write handled by one
+    worker only updates that worker's copy. Each process rebuilds its
+    copy every SEARCH_INDEX_REBUILD_INTERVAL seconds (search_index_rebuild
+    job), which bounds how stale the others can be.
+    """
+
+    _title_index = TrigramIndex()
+    _author_index = TrigramIndex()
+    _loaded = False
+    _load_lock = threading.Lock()
+
+    @staticmethod
+    def uses_database_index(db: Session) -> bool:
+        return db.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def build_index(db: Session) -> None:
+        with SearchService._load_lock:
+            # Built aside and swapped in: searches never see a half-filled index
+            title_index = TrigramIndex()
+            author_index = TrigramIndex()
+
+            for book_id, title in db.query(Book.id, Book.title).yield_per(1000):
+                title_index.add(book_id, title)
+
+            for author_id, name in db.query(Author.id, Author.name).yield_per(1000):
+                author_index.add(author_id, name)
+
+            SearchService._title_index = title_index
+            SearchService._author_index = author_index
+            SearchService._loaded = True
+
+    @staticmethod
+    def rebuild_index() -> int:
+        # Scheduled entry point: own session, returns the number of titles indexed
+        db = SessionLocal()
+        try:
+            SearchService.build_index(db)
+            return len(SearchService._title_index)
+        finally:
+            db.close()
+
+    @staticmethod
+    def ensure_index(db: Session) -> None:
+        if not SearchService._loaded:
+            SearchService.build_index(db)
+
+    # Index maintenance (no-ops until the index has been built)
+
+    @staticmethod
+    def index_book(book: Book) -> None:
+        SearchService.index_title(book.id, book.title)
+
+    @staticmethod
+    def index_title(book_id: int, title: str) -> None:
+        if SearchService._loaded:
+            SearchService._title_index.add(book_id, title)
+
+    @staticmethod
+    def remove_book(book_id: int) -> None:
+        if SearchService._loaded:
+            SearchService._title_index.remove(book_id)
+
+    @staticmethod
+    def index_author(author: Author) -> None:
+        if SearchService._loaded:
+            SearchService._author_index.add(author.id, author.name)
+
+    @staticmethod
+    def remove_author(author_id: int) -> None:
+        if SearchService._loaded:
+            SearchService._author_index.remove(author_id)
+
+    @staticmethod
+    def apply_text_filters(
+        db: Session,
+        query: Query,
+        search: BookSearch,
+        ranked: bool = True
+    ) -> Query:
+        """
+        Applies the title/author_name filters of `search` to a Book
+        query and, if `ranked`, orders it by relevance (best match first).
+        """
+        if not search.title and not search.author_name:
+            return query
+
+        if SearchService.uses_database_index(db):
+            return SearchService._apply_pg_trgm(db, query, search, ranked)
+
+        return SearchService._apply_memory_index(db, query, search, ranked)
+
+    @staticmethod
+    def _apply_pg_trgm(
+        db: Session,
+        query: Query,
+        search: BookSearch,
+        ranked: bool
+    ) -> Query:
+        # Threshold used by the `%` operator for this transaction only
+        db.execute(select(func.set_config(
+            "pg_trgm.similarity_threshold",
+            str(settings.SEARCH_SIMILARITY_THRESHOLD),
+            True
+        )))
+
+        rank = None
+
+        if search.title:
+            query = query.filter(or_(
+                Book.title.ilike(f"%{search.title}%"),
+                Book.title.op("%")(search.title)
+            ))
+            rank = func.similarity(Book.title, search.title)
+
+        if search.author_name:
+            query = query.join(Author).filter(or_(
+                Author.name.ilike(f"%{search.author_name}%"),
+                Author.name.op("%")(search.author_name)
+            ))
+            if rank is None:
+                rank = func.similarity(Author.name, search.author_name)
+
+        if not ranked:
+            return query
+
+        return query.order_by(rank.desc(), Book.id)
+
+    @staticmethod
+    def _apply_memory_index(
+        db: Session,
+        query: Query,
+        search: BookSearch,
+        ranked: bool
+    ) -> Query:
+        SearchService.ensure_index(db)
+        threshold = settings.SEARCH_SIMILARITY_THRESHOLD
+        # Caps the relevance CASE only; every match is filtered and counted
+        ranked_limit = settings.SEARCH_MAX_RESULTS
+
+        rank = None
+
+        if search.title:
+            matches = SearchService._title_index.search(search.title, threshold)
+            query = query.filter(Book.id.in_(SearchService._id_list(matches)))
+            if matches:
+                rank = case(dict(matches[:ranked_limit]), value=Book.id, else_=0.0)
+
+        if search.author_name:
+            matches = SearchService._author_index.search(search.author_name, threshold)
+            query = query.filter(Book.author_id.in_(SearchService._id_list(matches)))
+            if rank is None and matches:
+                rank = case(dict(matches[:ranked_limit]), value=Book.author_id, else_=0.0)
+
+        if rank is None or not ranked:
+            return query
+
+        return query.order_by(rank.desc(), Book.id)
+
+    @staticmethod
+    def _id_list(matches: List[Tuple[int, float]]):
+        # Integer ids rendered inline: a broad match can exceed SQLite's
+        # bound-parameter limit
+        return bindparam(
+            None,
+            [key for key, _ in matches],
+            expanding=True,
+            literal_execute=True
+        )
+
+
+"""
+Understanding Trigram Search:
+=============================
+A trigram is 3 consecutive characters. "potter" (padded as "  potter ")
+becomes: "  p", " po", "pot", "ott", "tte", "ter", "er "
+
+1. Substring search
+   Book.title.ilike("%pot%") needs every trigram of "pot" -> {"pot"}.
+   A trigram index finds the rows containing "pot" directly instead
+   of scanning every title.
+
+2. Fuzzy search
+   similarity = shared trigrams / all distinct trigrams of both strings
+   "Hary Poter" vs "Harry Potter" share most trigrams -> still a match.
+
+3. Ranking
+   Results are ordered by similarity, so "Potter" ranks
+   "Harry Potter" above "The Potter's Field and Other Stories".
+"""
@@ -0,0 +1,296 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.author import Author
+from app.models.book import Book
+from app.models.borrow import BorrowRecord
+from app.services.search import normalize
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index
+    =========================
+    Every word start of an entry's normalized text is stored as a key
+    ("harry potter" -> "harry potter", "potter"), kept sorted so a
+    prefix lookup is a binary search plus a short forward scan.
+
+    Prefixes of up to SHORT_PREFIX characters match too many keys for a
+    bounded scan, so they are served from a map of prefix -> entry ids
+    instead, with the top_k most popular ids per prefix cached and kept
+    in rank order as entries are added, bumped or removed.
+    """
+
+    SHORT_PREFIX = 3
+
+    def __init__(self, top_k: int = 50):
+        self.top_k = top_k
+        self._keys: List[Tuple[str, int]] = []
+        self._entries: Dict[int, Tuple[str, List[str]]] = {}
+        self._popularity: Dict[int, int] = {}
+        self._short: Dict[str, Set[int]] = {}
+        self._top: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _keys_of(text: str) -> List[str]:
+        norm = normalize(text)
+        return [norm[i:] for i in range(len(norm)) if i == 0 or norm[i - 1] == " "]
+
+    @staticmethod
+    def _short_prefixes(keys: List[str]) -> Set[str]:
+        return {
+            key[:length]
+            for key in keys
+            for length in range(1, min(len(key), PrefixIndex.SHORT_PREFIX) + 1)
+        }
+
+    def _rank(self, entry_id: int) -> tuple:
+        # Most borrowed first, then alphabetical
+        return (-self._popularity.get(entry_id, 0), self._entries[entry_id][0].lower(), entry_id)
+
+    def add(self, entry_id: int, text: str, popularity: Optional[int] = None) -> None:
+        keys = self._keys_of(text)
+
+        with self._lock:
+            self._discard(entry_id)
+            self._register(entry_id, text, keys, popularity)
+            for key in keys:
+                insort(self._keys, (key, entry_id))
+
+    def add_many(self, items: List[Tuple[int, str]]) -> None:
+        # Batch of adds: one merge of the key array instead of an insort per key
+        prepared = [(entry_id, text, self._keys_of(text)) for entry_id, text in items]
+        new_keys = sorted(
+            (key, entry_id) for entry_id, _, keys in prepared for key in keys
+        )
+
+        with self._lock:
+            for entry_id, text, keys in prepared:
+                self._discard(entry_id)
+                self._register(entry_id, text, keys, None)
+            self._keys = list(heapq.merge(self._keys, new_keys))
+
+    def load(self, items: List[Tuple[int, str, int]]) -> None:
+        # Bulk build: one sort instead of an insort per key
+        keys = []
+        entries = {}
+        popularity = {}
+        short: Dict[str, Set[int]] = {}
+        for entry_id, text, score in items:
+            entry_keys = self._keys_of(text)
+            entries[entry_id] = (text, entry_keys)
+            popularity[entry_id] = score
+            keys.extend((key, entry_id) for key in entry_keys)
+            for prefix in self._short_prefixes(entry_keys):
+                short.setdefault(prefix, set()).add(entry_id)
+        keys.sort()
+
+        with self._lock:
+            self._keys = keys
+            self._entries = entries
+            self._popularity = popularity
+            self._short = short
+            self._top = {}
+
+    def remove(self, entry_id: int) -> None:
+        with self._lock:
+            self._discard(entry_id)
+            self._popularity.pop(entry_id, None)
+
+    def bump(self, entry_id: int, delta: int = 1) -> None:
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return
+            self._popularity[entry_id] = self._popularity.get(entry_id, 0) + delta
+            for prefix in self._short_prefixes(entry[1]):
+                if delta >= 0:
+                    self._offer(prefix, entry_id)
+                elif entry_id in self._top.get(prefix, ()):
+                    # Dropping in rank: the next best may be outside the list
+                    del self._top[prefix]
+
+    def search(self, prefix: str, limit: int, max_scan: int) -> List[dict]:
+        needle = normalize(prefix)
+        if not needle:
+            return []
+
+        with self._lock:
+            if len(needle) <= self.SHORT_PREFIX:
+                ranked = self._top_ids(needle, limit)
+            else:
+                seen = set()
+                position = bisect_left(self._keys, (needle, -1))
+                end = min(len(self._keys), position + max_scan)
+                while position < end:
+                    key, entry_id = self._keys[position]
+                    if not key.startswith(needle):
+                        break
+                    seen.add(entry_id)
+                    position += 1
+                ranked = heapq.nsmallest(limit, seen, key=self._rank)
+
+            return [
+                {
+                    "id": entry_id,
+                    "text": self._entries[entry_id][0],
+                    "popularity": self._popularity.get(entry_id, 0)
+                }
+                for entry_id in ranked
+            ]
+
+    def _top_ids(self, prefix: str, limit: int) -> List[int]:
+        members = self._short.get(prefix)
+        if not members:
+            return []
+        if limit > self.top_k:
+            return heapq.nsmallest(limit, members, key=self._rank)
+
+        top = self._top.get(prefix)
+        if top is None:
+            top = self._top[prefix] = heapq.nsmallest(self.top_k, members, key=self._rank)
+        return top[:limit]
+
+    def _offer(self, prefix: str, entry_id: int) -> None:
+        # Re-rank entry_id in a cached top list (a rank can only have risen)
+        top = self._top.get(prefix)
+        if top is None:
+            return
+        if entry_id in top:
+            top.remove(entry_id)
+        insort(top, entry_id, key=self._rank)
+        # A list shorter than top_k holds every member of the prefix
+        if len(top) > self.top_k:
+            top.pop()
+
+    def _register(
+        self,
+        entry_id: int,
+        text: str,
+        keys: List[str],
+        popularity: Optional[int]
+    ) -> None:
+        self._entries[entry_id] = (text, keys)
+        if popularity is not None:
+            self._popularity[entry_id] = popularity
+        else:
+            self._popularity.setdefault(entry_id, 0)
+        for prefix in self._short_prefixes(keys):
+            self._short.setdefault(prefix, set()).add(entry_id)
+            self._offer(prefix, entry_id)
+
+    def _discard(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for key in entry[1]:
+            position = bisect_left(self._keys, (key, entry_id))
+            if position < len(self._keys) and self._keys[position] == (key, entry_id):
+                del self._keys[position]
+        for prefix in self._short_prefixes(entry[1]):
+            members = self._short.get(prefix)
+            if members is not None:
+                members.discard(entry_id)
+                if not members:
+                    del self._short[prefix]
+            if entry_id in self._top.get(prefix, ()):
+                # Rebuilt on the next lookup: the runner-up isn't cached
+                del self._top[prefix]
+
+
+class SuggestService:
+    """
+    Type-ahead Suggestions
+    ======================
+    Prefix matches on book titles and author names from in-memory
+    PrefixIndexes, ranked by popularity (number of borrows).
+    Built at startup; the book, author and borrow services keep it
+    current. Per process, like the search index.
+    """
+
+    _titles = PrefixIndex(settings.SUGGEST_TOP_K)
+    _authors = PrefixIndex(settings.SUGGEST_TOP_K)
+    _loaded = False
+    _load_lock = threading.Lock()
+
+    @staticmethod
+    def build_index(db: Session) -> None:
+        with SuggestService._load_lock:
+            borrows = dict(
+                db.query(BorrowRecord.book_id, func.count(BorrowRecord.id))
+                .group_by(BorrowRecord.book_id)
+                .all()
+            )
+
+            titles = []
+            author_borrows: Dict[int, int] = {}
+            for book_id, title, author_id in db.query(Book.id, Book.title, Book.author_id).yield_per(1000):
+                count = borrows.get(book_id, 0)
+                titles.append((book_id, title, count))
+                author_borrows[author_id] = author_borrows.get(author_id, 0) + count
+
+            authors = [
+                (author_id, name, author_borrows.get(author_id, 0))
+                for author_id, name in db.query(Author.id, Author.name).yield_per(1000)
+            ]
+
+            SuggestService._titles.load(titles)
+            SuggestService._authors.load(authors)
+            SuggestService._loaded = True
+
+    @staticmethod
+    def ensure_index(db: Session) -> None:
+        if not SuggestService._loaded:
+            SuggestService.build_index(db)
+
+    # Index maintenance (no-ops until the index has been built)
+
+    @staticmethod
+    def index_title(book_id: int, title: str) -> None:
+        if SuggestService._loaded:
+            SuggestService._titles.add(book_id, title)
+
+    @staticmethod
+    def index_titles(titles: List[Tuple[int, str]]) -> None:
+        if SuggestService._loaded:
+            SuggestService._titles.add_many(titles)
+
+    @staticmethod
+    def remove_book(book_id: int) -> None:
+        if SuggestService._loaded:
+            SuggestService._titles.remove(book_id)
+
+    @staticmethod
+    def index_author(author: Author) -> None:
+        if SuggestService._loaded:
+            SuggestService._authors.add(author.id, author.name)
+
+    @staticmethod
+    def remove_author(author_id: int) -> None:
+        if SuggestService._loaded:
+            SuggestService._authors.remove(author_id)
+
+    @staticmethod
+    def record_borrow(book_id: int, author_id: int) -> None:
+        if SuggestService._loaded:
+            SuggestService._titles.bump(book_id)
+            SuggestService._authors.bump(author_id)
+
+    @staticmethod
+    def suggest(db: Session, q: str, limit: int) -> dict:
+        SuggestService.ensure_index(db)
+        max_scan = settings.SUGGEST_MAX_SCAN
+        return {
+            "books": SuggestService._titles.search(q, limit, max_scan),
+            "authors": SuggestService._authors.search(q, limit, max_scan)
+        }
@@ -2,6 +2,8 @@
 from app.utils.security import (
     get_password_hash,
     verify_password,
+    hash_password_pooled,
+    verify_password_pooled,
     create_access_token,
     decode_access_token
 )
@@ -10,6 +12,8 @@ from app.utils.dependencies import get_current_user, get_current_active_user
 __all__ = [
     "get_password_hash",
     "verify_password",
+    "hash_password_pooled",
+    "verify_password_pooled",
     "create_access_token",
     "decode_access_token",
     "get_current_user",
@@ -0,0 +1,195 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class CacheBackend(ABC):
+    """
+    Storage used by ReadThroughCache.
+    Subclass this to plug in another store (e.g. Redis).
+    """
+
+    evictions: int = 0
+
+    def __len__(self) -> int:
+        return 0
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class NullCache(CacheBackend):
+    # Caching disabled: every lookup is a miss
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def delete(self, key: Hashable) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class TTLCache(CacheBackend):
+    """
+    In-process cache with a size bound and per-entry time-to-live.
+    When full, the least recently used entry is dropped.
+    Thread-safe (FastAPI runs sync routes in a threadpool).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        # Drop every entry whose key matches
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+
+class ReadThroughCache:
+    """
+    Read-through cache with hit/miss counters.
+    get_or_load() returns the cached value or calls the loader
+    and stores its result.
+
+    A load that overlaps an invalidate() of its key (or a clear()) may
+    have read the old row, so its result is returned but not stored:
+    keys with loads in flight carry a generation that invalidate()
+    bumps and the load checks before storing.
+    """
+
+    # name -> cache, for the monitoring endpoint
+    registry: Dict[str, "ReadThroughCache"] = {}
+
+    def __init__(self, name: str, backend: CacheBackend):
+        self.name = name
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.stale_loads = 0  # loads not stored: invalidated while loading
+        # key -> [loads in flight, generation]; only keys being loaded
+        self._loading: Dict[Hashable, List[int]] = {}
+        self._epoch = 0  # bumped by clear()
+        self._lock = threading.Lock()
+        ReadThroughCache.registry[name] = self
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        with self._lock:
+            loading = self._loading.setdefault(key, [0, 0])
+            loading[0] += 1
+            started = (loading[1], self._epoch)
+
+        try:
+            value = loader()
+            with self._lock:
+                # Skip the store if the key was invalidated meanwhile
+                if (loading[1], self._epoch) == started:
+                    self.backend.set(key, value)
+                else:
+                    self.stale_loads += 1
+            return value
+        finally:
+            with self._lock:
+                loading[0] -= 1
+                if loading[0] == 0:
+                    del self._loading[key]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        # Cached value or None; never loads (a miss is not counted)
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self.backend.delete(key)
+                if key in self._loading:
+                    self._loading[key][1] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.backend.clear()
+            self._epoch += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "size": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_loads": self.stale_loads,
+            "evictions": self.backend.evictions
+        }
+
+
+def make_backend(kind: str, maxsize: int, ttl: float) -> CacheBackend:
+    if kind == "memory":
+        return TTLCache(maxsize=maxsize, ttl=ttl)
+    if kind == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {kind}")
@@ -0,0 +1,43 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts) -> str:
+    # Strong ETag: digest of everything the response body depends on
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    True if an If-None-Match header value matches `etag`.
+    Handles "*", comma-separated lists and W/ prefixes
+    (If-None-Match uses weak comparison).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+"""
+Understanding ETags:
+====================
+1. First request
+   GET /api/v1/books/1            -> 200, ETag: "3f1c..."
+
+2. Client asks again, sending the tag back
+   GET /api/v1/books/1
+   If-None-Match: "3f1c..."       -> 304 Not Modified (empty body)
+
+The ETag is built from row version numbers, which go up on every
+UPDATE, so it changes exactly when the response would change.
+"""
@@ -0,0 +1,125 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+from sqlalchemy import String, and_, literal, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def encode_cursor(sort_key: str, value: Any, row_id: int) -> str:
+    # Opaque token: base64url(JSON) of the last row's (sort value, id)
+    payload = json.dumps(
+        {"k": sort_key, "v": value, "id": row_id},
+        default=str,  # dates/datetimes -> ISO strings
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _is_int(value: Any) -> bool:
+    # JSON true/false decode to bool, which is an int subclass
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_cursor(token: str, sort_key: str) -> Tuple[Any, int]:
+    """
+    Returns the (sort value, id) stored in a cursor.
+    Raises ValueError if the token is malformed or was issued
+    for a different sort order. The sort value is always a str, an
+    int or None (see encode_cursor); anything else is a forged token.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, value, row_id = payload["k"], payload["v"], payload["id"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Malformed cursor")
+
+    if key != sort_key or not _is_int(row_id):
+        raise ValueError("Cursor does not match the requested sort order")
+
+    if value is not None and not isinstance(value, str) and not _is_int(value):
+        raise ValueError("Malformed cursor")
+
+    return value, row_id
+
+
+def cursor_timestamp(value: str, dialect_name: str) -> Any:
+    """
+    Turns a cursor's ISO timestamp back into a bound value for keyset_filter.
+    SQLite keeps server_default timestamps as CURRENT_TIMESTAMP text
+    ("YYYY-MM-DD HH:MM:SS"), so there it is compared in that same format.
+    """
+    timestamp = datetime.fromisoformat(value)
+    if dialect_name == "sqlite":
+        return literal(timestamp.isoformat(sep=" "), String)
+    return timestamp
+
+
+def keyset_filter(
+    sort_column,
+    id_column,
+    value: Any,
+    row_id: int,
+    descending: bool = False,
+    nullable: bool = False
+) -> ColumnElement:
+    """
+    Condition selecting rows strictly after (value, row_id) for a query
+    ordered by (sort_column, id_column), both ascending or both descending.
+
+    Written as a row-value comparison so the database can seek into a
+    composite (sort_column, id) index instead of skipping OFFSET rows.
+
+    For nullable sort columns, NULLs are expected last when ascending and
+    first when descending (see order_by_keyset), i.e. one index order
+    read forwards or backwards.
+    """
+    if sort_column is id_column:
+        return id_column < row_id if descending else id_column > row_id
+
+    row = tuple_(sort_column, id_column)
+
+    if not nullable:
+        return row < tuple_(value, row_id) if descending else row > tuple_(value, row_id)
+
+    if descending:
+        if value is None:
+            # Still inside the leading NULL block, then every non-NULL row
+            return or_(
+                and_(sort_column.is_(None), id_column < row_id),
+                sort_column.isnot(None)
+            )
+        return row < tuple_(value, row_id)
+
+    if value is None:
+        # Inside the trailing NULL block
+        return and_(sort_column.is_(None), id_column > row_id)
+    return or_(row > tuple_(value, row_id), sort_column.is_(None))
+
+
+def order_by_keyset(sort_column, id_column, descending: bool = False) -> list:
+    # ORDER BY matching keyset_filter (NULLS LAST asc / NULLS FIRST desc)
+    if sort_column is id_column:
+        return [id_column.desc() if descending else id_column.asc()]
+    if descending:
+        return [sort_column.desc().nulls_first(), id_column.desc()]
+    return [sort_column.asc().nulls_last(), id_column.asc()]
+
+
+"""
+Understanding Keyset Pagination:
+================================
+OFFSET pagination:
+  SELECT ... ORDER BY id LIMIT 10 OFFSET 100000
+  -> database reads and throws away 100000 rows first
+
+Keyset (cursor) pagination:
+  SELECT ... WHERE id > :last_seen_id ORDER BY id LIMIT 10
+  -> database jumps straight to :last_seen_id in the index
+
+Every page costs the same, no matter how deep the client goes.
+The cursor is just the last row's sort key, encoded so clients
+treat it as an opaque token.
+"""
@@ -0,0 +1,137 @@
+import asyncio
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from app.database import engine
+
+
+@contextmanager
+def leader_lock(name: str) -> Iterator[bool]:
+    """
+    Yields True if this process may run the job `name` now.
+    On PostgreSQL that is a session-level pg_try_advisory_lock on a
+    pooled connection, held until the block exits; whichever worker
+    gets it runs the job, the others skip that round.
+    Other databases have no cross-process lock: always True, so deploy
+    a single worker (or enable the job on one only).
+    """
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    key = zlib.crc32(name.encode())
+    with engine.connect() as conn:
+        acquired = conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+        ).scalar()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+
+class PeriodicJob:
+    """
+    Runs a blocking function every `interval` seconds on the app's
+    event loop (the function itself runs in the threadpool).
+    Keeps run-duration metrics for the monitoring endpoint.
+    A failing run is counted and logged; the job keeps its schedule.
+
+    Exclusive jobs (database-wide work: sweeps, cleanups) run in one
+    worker at a time, see leader_lock; a round another worker holds is
+    counted as skipped.
+    """
+
+    # name -> job, for the monitoring endpoint
+    registry: Dict[str, "PeriodicJob"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        interval: float,
+        exclusive: bool = False
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.exclusive = exclusive
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds: Optional[float] = None
+        self.last_started_at: Optional[datetime] = None
+        self.last_result: Any = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        PeriodicJob.registry[name] = self
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> Any:
+        self.last_started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            self.last_result = await run_in_threadpool(self._call)
+            self.last_error = None
+            return self.last_result
+        except Exception as exc:
+            self.failures += 1
+            self.last_error = repr(exc)
+            print(f"⚠️ Job {self.name} failed: {exc!r}")
+        finally:
+            elapsed = time.perf_counter() - started
+            self.runs += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+            self.last_seconds = elapsed
+
+    def _call(self) -> Any:
+        if not self.exclusive:
+            return self.func()
+        with leader_lock(self.name) as acquired:
+            if not acquired:
+                self.skipped += 1
+                return None
+            return self.func()
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval,
+            "running": self._task is not None,
+            "exclusive": self.exclusive,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started_at": self.last_started_at,
+            "last_duration_seconds": self.last_seconds,
+            "avg_duration_seconds": self.total_seconds / self.runs if self.runs else None,
+            "max_duration_seconds": self.max_seconds,
+            "last_result": self.last_result,
+            "last_error": self.last_error
+        }
@@ -1,5 +1,10 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
@@ -15,6 +20,105 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHashPool:
+    """
+    Dedicated, bounded pool for bcrypt.
+    bcrypt releases the GIL, so a few threads of its own keep hashing
+    off Starlette's shared threadpool: a login burst queues here instead
+    of taking the threads catalog and borrow endpoints run on.
+    At most workers + queue_size hashes are admitted at once; beyond
+    that callers get an immediate 503 with Retry-After.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_hash = 0.0
+        self.max_wait = 0.0
+        self.max_hash = 0.0
+
+    def _admit(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def _timed(self, submitted: float, func: Callable[..., Any], *args) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self.running += 1
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.running -= 1
+                self.in_flight -= 1
+                self.completed += 1
+                self.total_wait += started - submitted
+                self.total_hash += finished - started
+                self.max_wait = max(self.max_wait, started - submitted)
+                self.max_hash = max(self.max_hash, finished - started)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        if not self._admit():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, retry shortly",
+                headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)}
+            )
+        try:
+            future = self._executor.submit(self._timed, time.perf_counter(), func, *args)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        # A disconnecting client doesn't cancel a started hash; its slot
+        # frees when the hash finishes
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "running": self.running,
+                "queue_depth": self.in_flight - self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.total_wait / completed * 1000, 2),
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "avg_hash_ms": round(self.total_hash / completed * 1000, 2),
+                "max_hash_ms": round(self.max_hash * 1000, 2)
+            }
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE
+)
+
+
+async def hash_password_pooled(password: str) -> str:
+    # get_password_hash on the bcrypt pool (503 when it's saturated)
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+async def verify_password_pooled(plain_password: str, hashed_password: str) -> bool:
+    # verify_password on the bcrypt pool (503 when it's saturated)
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     # Copy data to avoid modifying original
     to_encode = data.copy()
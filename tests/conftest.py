@@ -0,0 +1,119 @@
+"""
+Test fixtures
+=============
+Tests run against a throwaway SQLite file (or TEST_DATABASE_URL).
+Settings are read at import time, so the environment is set up
+before anything from `app` is imported.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/test.db"
+)
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DEBUG", "False")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import Base, SessionLocal, engine, init_db
+from app.main import app
+from app.models.author import Author
+from app.models.book import Book
+from app.services.book import BookService
+from app.services.search import SearchService
+from app.services.suggest import SuggestService
+from app.utils.cache import ReadThroughCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_database():
+    # Empty schema and cold in-process caches/indexes for every test
+    init_db()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    for cache in ReadThroughCache.registry.values():
+        cache.clear()
+    BookService.invalidate_counts()
+    SearchService._loaded = False
+    SuggestService._loaded = False
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    # No context manager: startup (background jobs) isn't run
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(client):
+    client.post("/api/v1/auth/register", json={
+        "email": "reader@example.com",
+        "username": "reader",
+        "password": "password123"
+    })
+    token = client.post("/api/v1/auth/login", data={
+        "username": "reader",
+        "password": "password123"
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def make_books(db):
+    # make_books(n, copies=1) -> ids of n books, each by its own author
+    def make(count: int, copies: int = 1):
+        authors = [Author(name=f"Author {i}") for i in range(count)]
+        db.add_all(authors)
+        db.flush()
+        books = [
+            Book(
+                title=f"Book {i}",
+                author_id=author.id,
+                isbn=f"978{i:010d}",
+                total_copies=copies,
+                available_copies=copies
+            )
+            for i, author in enumerate(authors)
+        ]
+        db.add_all(books)
+        db.commit()
+        return [book.id for book in books]
+    return make
+
+
+@pytest.fixture
+def count_statements():
+    """
+    with count_statements() as statements: ...
+    statements[0] is the number of SQL statements sent meanwhile.
+    """
+    @contextmanager
+    def counting():
+        statements = [0]
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements[0] += 1
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
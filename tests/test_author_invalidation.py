@@ -0,0 +1,23 @@
+"""
+Renaming an author drops cached search totals and facets that depend
+on the name.
+"""
+
+
+def test_rename_author_refreshes_author_name_totals_and_facets(client, auth_headers, make_books):
+    make_books(3)
+
+    # Cached: nobody is called that yet
+    before = client.get("/api/v1/books/?author_name=Hildegard&facets=author", headers=auth_headers).json()
+    assert before["total"] == 0
+    facets = client.get("/api/v1/books/?facets=author", headers=auth_headers).json()["facets"]
+    assert "Author 1" in {entry["author_name"] for entry in facets["author"]}
+
+    response = client.patch("/api/v1/authors/2", json={"name": "Hildegard"}, headers=auth_headers)
+    assert response.status_code == 200
+
+    after = client.get("/api/v1/books/?author_name=Hildegard&facets=author", headers=auth_headers).json()
+    assert after["total"] == 1
+    assert after["facets"]["author"][0]["author_name"] == "Hildegard"
+    facets = client.get("/api/v1/books/?facets=author", headers=auth_headers).json()["facets"]
+    assert {entry["author_name"] for entry in facets["author"]} == {"Author 0", "Hildegard", "Author 2"}
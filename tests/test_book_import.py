@@ -0,0 +1,65 @@
+"""
+Bulk import: per-row errors for undecodable lines, and a concurrent
+ISBN conflict only fails the conflicting row.
+"""
+
+from app.database import SessionLocal
+from app.models.book import Book
+from app.services.book_import import BookImportService
+
+
+def test_invalid_utf8_line_is_a_row_error(client, auth_headers, make_books):
+    make_books(1)
+    body = (
+        b'{"title": "Good One", "author_id": 1}\n'
+        b'{"title": "Bad \xff\xfe", "author_id": 1}\n'
+        b'{"title": "Good Two", "author_id": 1}\n'
+    )
+
+    response = client.post(
+        "/api/v1/books/import?format=ndjson",
+        content=body,
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 2
+    assert [error["row"] for error in result["errors"]] == [2]
+    assert "Invalid UTF-8" in result["errors"][0]["error"]
+
+
+def test_concurrent_isbn_conflict_retries_without_that_row(client, auth_headers, make_books, monkeypatch):
+    make_books(1)
+    check_rows = BookImportService._check_rows
+    calls = []
+
+    def check_then_race(db, candidates, errors):
+        rows = check_rows(db, candidates, errors)
+        if not calls:
+            # Another request takes row 2's ISBN between check and INSERT
+            other = SessionLocal()
+            other.add(Book(title="Racer", author_id=1, isbn="9780000000222", total_copies=1, available_copies=1))
+            other.commit()
+            other.close()
+        calls.append(len(rows))
+        return rows
+
+    monkeypatch.setattr(BookImportService, "_check_rows", staticmethod(check_then_race))
+
+    body = (
+        "title,author_id,isbn\n"
+        "First,1,9780000000111\n"
+        "Second,1,9780000000222\n"
+        "Third,1,9780000000333\n"
+    )
+    response = client.post(
+        "/api/v1/books/import?format=csv",
+        content=body,
+        headers=dict(auth_headers, **{"content-type": "text/csv"})
+    )
+
+    result = response.json()
+    assert calls == [3, 2]
+    assert result["imported"] == 2
+    assert result["errors"] == [{"row": 2, "error": "Book with ISBN 9780000000222 already exists"}]
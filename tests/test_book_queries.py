@@ -0,0 +1,75 @@
+"""
+Book endpoints issue a fixed number of SQL statements, however many
+books (and distinct authors) a page holds: authors are loaded in bulk,
+never one lazy SELECT per row.
+"""
+
+import pytest
+
+
+PAGE_SIZES = [2, 10, 30]
+
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def test_list_books_statement_count_is_fixed(client, auth_headers, make_books, count_statements, page_size):
+    make_books(30)
+
+    with count_statements() as statements:
+        response = client.get(f"/api/v1/books/?page_size={page_size}", headers=auth_headers)
+
+    assert response.status_code == 200
+    books = response.json()["books"]
+    assert len(books) == page_size
+    assert all(book["author_name"] for book in books)
+    # user lookup, count, page, one selectin query for all the page's authors
+    assert statements[0] == 4
+
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def test_cursor_page_statement_count_is_fixed(client, auth_headers, make_books, count_statements, page_size):
+    make_books(30)
+
+    with count_statements() as statements:
+        response = client.get(f"/api/v1/books/?pagination=cursor&page_size={page_size}", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(response.json()["books"]) == page_size
+    # user lookup, page, one selectin query for all the page's authors
+    assert statements[0] == 3
+
+
+def test_get_book_statement_count(client, auth_headers, make_books, count_statements):
+    book_id = make_books(3)[1]
+
+    with count_statements() as statements:
+        response = client.get(f"/api/v1/books/{book_id}", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["author_name"] == "Author 1"
+    # user lookup, book with its author
+    assert statements[0] == 2
+
+
+def test_create_book_statement_count(client, auth_headers, make_books, count_statements):
+    make_books(3)
+    payload = {"title": "New Book", "author_id": 2, "isbn": "9781234567897", "total_copies": 2, "available_copies": 2}
+
+    with count_statements() as statements:
+        response = client.post("/api/v1/books/", json=payload, headers=auth_headers)
+
+    assert response.status_code == 201
+    assert response.json()["author_name"] == "Author 1"
+    # user lookup, author check, ISBN check, INSERT, change event, reload with author
+    assert statements[0] == 6
+
+
+def test_update_book_statement_count(client, auth_headers, make_books, count_statements):
+    book_id = make_books(3)[0]
+
+    with count_statements() as statements:
+        response = client.patch(f"/api/v1/books/{book_id}", json={"title": "Renamed", "author_id": 3}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["author_name"] == "Author 2"
+    # user lookup, book, author check, change event, UPDATE, reload with author
+    assert statements[0] == 6
@@ -0,0 +1,79 @@
+"""
+Concurrent borrows of one book never hand out more copies than it has:
+the conditional UPDATE in _take_copy lets exactly `copies` of them through.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.database import SessionLocal
+from app.models.book import Book
+from app.models.borrow import BorrowRecord
+from app.models.user import User
+from app.schemas.borrow import BorrowCreate
+from app.services.borrow import BorrowService
+
+
+BORROWERS = 200
+COPIES = 5
+# pool_size + max_overflow is 15 connections; one is left for the watcher
+WORKERS = 14
+
+
+def test_concurrent_borrows_take_exactly_the_available_copies(db, make_books):
+    book_id = make_books(1, copies=COPIES)[0]
+    users = [
+        User(email=f"user{i}@example.com", username=f"user{i}", hashed_password="x", is_active=True)
+        for i in range(BORROWERS)
+    ]
+    db.add_all(users)
+    db.commit()
+    user_ids = [user.id for user in users]
+
+    # The first wave starts together, so the borrows really do overlap
+    first_wave = set(user_ids[:WORKERS])
+    start = threading.Barrier(WORKERS)
+
+    def borrow(user_id):
+        session = SessionLocal()
+        try:
+            if user_id in first_wave:
+                start.wait()
+            user = session.get(User, user_id)
+            BorrowService.borrow_book(session, user, BorrowCreate(book_id=book_id))
+            return True
+        except HTTPException as e:
+            assert e.status_code == 400
+            return False
+        finally:
+            session.close()
+
+    lowest = [COPIES]
+
+    def watch(done):
+        # Samples the counter while the borrows run
+        session = SessionLocal()
+        try:
+            while not done.is_set():
+                copies = session.query(Book.available_copies).filter(Book.id == book_id).scalar()
+                lowest[0] = min(lowest[0], copies)
+                session.rollback()
+        finally:
+            session.close()
+
+    done = threading.Event()
+    watcher = threading.Thread(target=watch, args=(done,))
+    watcher.start()
+    try:
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            results = list(pool.map(borrow, user_ids))
+    finally:
+        done.set()
+        watcher.join()
+
+    db.expire_all()
+    assert sum(results) == COPIES
+    assert db.get(Book, book_id).available_copies == 0
+    assert lowest[0] >= 0
+    assert db.query(BorrowRecord).filter(BorrowRecord.book_id == book_id).count() == COPIES
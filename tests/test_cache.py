@@ -0,0 +1,56 @@
+"""
+ReadThroughCache must not store a value loaded before an invalidation
+that happened while the load was running.
+"""
+
+import threading
+
+import pytest
+
+from app.utils.cache import CacheBackend, ReadThroughCache, TTLCache
+
+
+def test_invalidate_during_load_is_not_overwritten():
+    cache = ReadThroughCache("test-race", TTLCache())
+    loading = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow_loader():
+        # Reads the "old row", then stalls until the writer has invalidated
+        loading.set()
+        release.wait(5)
+        return "old"
+
+    reader = threading.Thread(target=lambda: results.append(cache.get_or_load("book", slow_loader)))
+    reader.start()
+    loading.wait(5)
+    cache.invalidate("book")  # writer commits and invalidates
+    release.set()
+    reader.join(5)
+
+    assert results == ["old"]  # the overlapping reader still gets its value
+    assert cache.peek("book") is None  # but it isn't cached
+    assert cache.get_or_load("book", lambda: "new") == "new"
+    assert cache.peek("book") == "new"
+    assert cache.stale_loads == 1
+
+
+def test_clear_during_load_is_not_overwritten():
+    cache = ReadThroughCache("test-clear", TTLCache())
+
+    def loader():
+        cache.clear()
+        return "old"
+
+    assert cache.get_or_load("book", loader) == "old"
+    assert cache.peek("book") is None
+
+
+def test_backend_must_implement_the_interface():
+    class Partial(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
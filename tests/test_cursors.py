@@ -0,0 +1,53 @@
+"""
+Forged or mismatched cursors are rejected with 400, never a 500.
+"""
+import base64
+import json
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def forge(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+FORGED_VALUES = [{"a": 1}, [1, 2], 1.5, True]
+
+
+def test_decode_cursor_round_trip():
+    assert decode_cursor(encode_cursor("title", "Dune", 7), "title") == ("Dune", 7)
+    assert decode_cursor(encode_cursor("id", None, 7), "id") == (None, 7)
+
+
+@pytest.mark.parametrize("value", FORGED_VALUES)
+def test_decode_cursor_rejects_other_json_types(value):
+    with pytest.raises(ValueError):
+        decode_cursor(forge({"k": "title", "v": value, "id": 1}), "title")
+
+
+@pytest.mark.parametrize("sort, value", [
+    ("title", {"a": 1}),
+    ("title", 5),
+    ("availability", "five"),
+    ("published_date", 5),
+    ("created_at", 5),
+    ("-created_at", "not a date"),
+])
+def test_books_cursor_forged_value_is_400(client, auth_headers, make_books, sort, value):
+    make_books(3)
+    cursor = forge({"k": sort, "v": value, "id": 1})
+
+    response = client.get(f"/api/v1/books/?sort={sort}&cursor={cursor}", headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("value", [None, 5, [1], "not a date"])
+def test_borrow_history_cursor_forged_value_is_400(client, auth_headers, value):
+    cursor = forge({"k": "-borrow_date", "v": value, "id": 1})
+
+    response = client.get(f"/api/v1/borrow/history?cursor={cursor}", headers=auth_headers)
+
+    assert response.status_code == 400
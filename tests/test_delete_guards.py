@@ -0,0 +1,29 @@
+"""
+Deleting an author never removes their books: the API refuses, and so
+does the database's foreign key.
+"""
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+
+from app.models.author import Author
+from app.models.book import Book
+
+
+def test_author_with_books_is_not_deleted(client, auth_headers, make_books):
+    book_id = make_books(1)[0]
+
+    response = client.delete("/api/v1/authors/1", headers=auth_headers)
+    assert response.status_code == 400
+    assert client.get(f"/api/v1/books/{book_id}", headers=auth_headers).status_code == 200
+
+
+def test_books_author_foreign_key_restricts(db, make_books):
+    make_books(1)
+
+    with pytest.raises(IntegrityError):
+        db.execute(delete(Author).where(Author.id == 1))
+        db.flush()
+    db.rollback()
+
+    assert db.query(Book).count() == 1
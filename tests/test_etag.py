@@ -0,0 +1,39 @@
+"""
+Conditional GETs compare against the committed row, even when the
+in-process cache holds an older copy (e.g. written by another worker).
+"""
+
+from sqlalchemy import update
+
+from app.models.author import Author
+from app.models.book import Book
+
+
+def test_book_etag_ignores_stale_cache(client, auth_headers, make_books, db):
+    book_id = make_books(1)[0]
+    first = client.get(f"/api/v1/books/{book_id}", headers=auth_headers)
+    etag = first.headers["ETag"]
+
+    cached = client.get(f"/api/v1/books/{book_id}", headers=dict(auth_headers, **{"If-None-Match": etag}))
+    assert cached.status_code == 304
+
+    # Another process updates the row; this process's cache isn't told
+    db.execute(update(Book).where(Book.id == book_id).values(title="Elsewhere", version=Book.version + 1))
+    db.commit()
+
+    fresh = client.get(f"/api/v1/books/{book_id}", headers=dict(auth_headers, **{"If-None-Match": etag}))
+    assert fresh.status_code == 200
+    assert fresh.json()["title"] == "Elsewhere"
+    assert fresh.headers["ETag"] != etag
+
+
+def test_author_etag_ignores_stale_cache(client, auth_headers, make_books, db):
+    make_books(1)
+    etag = client.get("/api/v1/authors/1", headers=auth_headers).headers["ETag"]
+
+    db.execute(update(Author).where(Author.id == 1).values(name="Elsewhere", version=Author.version + 1))
+    db.commit()
+
+    fresh = client.get("/api/v1/authors/1", headers=dict(auth_headers, **{"If-None-Match": etag}))
+    assert fresh.status_code == 200
+    assert fresh.json()["name"] == "Elsewhere"
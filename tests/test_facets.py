@@ -0,0 +1,58 @@
+"""
+Facets: the author top-N is ranked and limited in SQL, and each
+requested facet costs one aggregate query.
+"""
+from datetime import date
+
+from app.config import settings
+from app.models.book import Book
+
+
+def test_author_facet_is_top_n_by_count(client, auth_headers, make_books, db, monkeypatch):
+    monkeypatch.setattr(settings, "FACET_AUTHOR_LIMIT", 2)
+    book_ids = make_books(6)
+    # Author 3 gets three books, Author 5 two; the rest keep one each
+    for book_id, author_id in zip(book_ids, [4, 4, 4, 6, 6, 1]):
+        db.get(Book, book_id).author_id = author_id
+    db.commit()
+
+    response = client.get("/api/v1/books/?facets=author", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["facets"]["author"] == [
+        {"author_id": 4, "author_name": "Author 3", "count": 3},
+        {"author_id": 6, "author_name": "Author 5", "count": 2}
+    ]
+
+
+def test_availability_and_year_facets(client, auth_headers, make_books, db):
+    book_ids = make_books(3)
+    first, second, _ = (db.get(Book, book_id) for book_id in book_ids)
+    first.available_copies = 0
+    first.published_date = date(1994, 5, 1)
+    second.published_date = date(1999, 1, 1)
+    db.commit()
+
+    facets = client.get(
+        "/api/v1/books/?facets=availability,year", headers=auth_headers
+    ).json()["facets"]
+
+    assert facets["availability"] == [
+        {"value": "available", "count": 2},
+        {"value": "unavailable", "count": 1}
+    ]
+    assert facets["year"] == [
+        {"from": 1990, "to": 1999, "label": "1990s", "count": 2},
+        {"from": None, "to": None, "label": "unknown", "count": 1}
+    ]
+
+
+def test_facet_statement_count(client, auth_headers, make_books, count_statements):
+    make_books(10)
+
+    with count_statements() as statements:
+        response = client.get("/api/v1/books/?facets=author,year", headers=auth_headers)
+
+    assert response.status_code == 200
+    # user lookup, count, page, authors selectin, one aggregate per facet
+    assert statements[0] == 6
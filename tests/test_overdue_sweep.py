@@ -0,0 +1,50 @@
+"""
+The overdue sweep marks loans in chunks and reports how many it marked;
+database-wide jobs are marked exclusive.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import app.main  # registers the background jobs
+from app.models.borrow import BorrowRecord, BorrowStatus
+from app.models.user import User
+from app.services.borrow import BorrowService
+from app.utils.scheduler import PeriodicJob
+
+
+def test_check_overdue_books_returns_the_count(db, make_books):
+    book_ids = make_books(7)
+    user = User(email="late@example.com", username="late", hashed_password="x", is_active=True)
+    db.add(user)
+    db.flush()
+    now = datetime.utcnow()
+    db.add_all(
+        BorrowRecord(
+            user_id=user.id,
+            book_id=book_id,
+            book_title=f"Book {i}",
+            # The last two aren't due yet
+            due_date=now - timedelta(days=1) if i < 5 else now + timedelta(days=1),
+            status=BorrowStatus.BORROWED
+        )
+        for i, book_id in enumerate(book_ids)
+    )
+    db.commit()
+
+    assert BorrowService.check_overdue_books(db, chunk_size=2) == 5
+    assert BorrowService.check_overdue_books(db, chunk_size=2) == 0
+    assert db.query(BorrowRecord).filter(BorrowRecord.status == BorrowStatus.OVERDUE).count() == 5
+
+
+def test_exclusive_jobs():
+    exclusive = {name for name, job in PeriodicJob.registry.items() if job.exclusive}
+    assert exclusive == {"overdue_sweep", "borrow_archive", "idempotency_cleanup", "change_feed_prune"}
+
+
+def test_exclusive_job_runs_when_no_other_worker_holds_it():
+    job = PeriodicJob("test_exclusive", lambda: 3, interval=60, exclusive=True)
+    try:
+        assert asyncio.run(job.run_once()) == 3
+        assert job.stats()["skipped"] == 0
+    finally:
+        PeriodicJob.registry.pop("test_exclusive")
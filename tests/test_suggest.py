@@ -0,0 +1,47 @@
+"""
+Suggestions rank every match by popularity, however many keys share the
+prefix; the per-prefix top lists follow adds, bumps and removals.
+"""
+from app.services.suggest import PrefixIndex
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_short_prefix_ranks_beyond_the_scan_window():
+    index = PrefixIndex(top_k=3)
+    # The most borrowed title sorts last alphabetically
+    index.load([(i, f"book {i:03d}", 0) for i in range(100)] + [(100, "book zzz", 9)])
+
+    assert ids(index.search("b", 2, max_scan=10)) == [100, 0]
+    assert ids(index.search("boo", 5, max_scan=10)) == [100, 0, 1, 2, 3]
+
+
+def test_top_lists_follow_updates():
+    index = PrefixIndex(top_k=2)
+    index.load([(1, "alpha", 1), (2, "apple", 2), (3, "avocado", 0)])
+    assert ids(index.search("a", 2, max_scan=10)) == [2, 1]
+
+    index.bump(3, 5)
+    assert ids(index.search("a", 2, max_scan=10)) == [3, 2]
+
+    index.remove(3)
+    assert ids(index.search("a", 2, max_scan=10)) == [2, 1]
+
+    index.add_many([(4, "apricot"), (5, "banana")])
+    index.bump(4, 3)
+    assert ids(index.search("a", 2, max_scan=10)) == [4, 2]
+    assert ids(index.search("ap", 5, max_scan=10)) == [4, 2]
+
+    # Renamed out of the prefix
+    index.add(4, "cherry")
+    assert ids(index.search("a", 2, max_scan=10)) == [2, 1]
+
+
+def test_long_prefix_uses_the_key_scan():
+    index = PrefixIndex()
+    index.load([(1, "Harry Potter", 3), (2, "Harriet the Spy", 5), (3, "Pottery", 1)])
+
+    assert ids(index.search("harr", 10, max_scan=100)) == [2, 1]
+    assert ids(index.search("pott", 10, max_scan=100)) == [1, 3]